@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+BlockScout AI - Formatter micro-benchmark
+Compares telegram_format.format_for_telegram with the original handler
+pipeline (replace chain + rescanning blank-line loop) on long responses
+
+Usage: python benchmarks/bench_formatter.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telegram_format import format_for_telegram, split_message  # noqa: E402
+
+
+def legacy_format(text: str) -> str:
+    """The replace() chain previously duplicated in every handler"""
+    text = text.replace('**', '')
+    text = text.replace('••', '')
+    text = text.replace('Address:', '\n\n📍 Address:')
+    text = text.replace('Token:', '\n\n🪙 Token:')
+    text = text.replace('Holders:', '\n\n👥 Holders:')
+    text = text.replace('24h Volume:', '\n\n📊 Volume:')
+    text = text.replace('Recent Activity:', '\n\n🔍 Activity:')
+    text = text.replace('Risk:', '\n\n⚠️ Risk:')
+    text = text.replace('Key Insights:', '\n\n💡 Insights:')
+    text = text.replace('•', '\n•')
+    while '\n\n\n' in text:
+        text = text.replace('\n\n\n', '\n\n')
+    return text
+
+
+SAMPLE = (
+    "**Address:** 0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045 Token: WHITE "
+    "Holders: 12,345 24h Volume: $1.2M\n\n\n\n"
+    "Recent Activity: • Swapped 10 ETH • Received 500 USDC • Minted NFT\n\n\n"
+    "Risk: LOW • Verified contract • Distributed holders\n"
+    "Key Insights: • Long-term holder • Active trader • Public figure\n\n\n\n"
+)
+
+
+CASES = {
+    "response": lambda repeats: SAMPLE * repeats,
+    "blank-runs": lambda repeats: ("x" + "\n" * 200) * repeats,
+}
+
+
+def main() -> None:
+    print(f"{'case':>10} {'size':>10} {'legacy µs':>12} {'formatter µs':>13} {'speedup':>8} {'chunks':>7}")
+    for case, build in CASES.items():
+        for repeats in (1, 10, 100, 1000):
+            text = build(repeats)
+            assert legacy_format(text) == format_for_telegram(text), "formatter output differs"
+
+            number = max(1, 2000 // repeats)
+            legacy = min(timeit.repeat(lambda: legacy_format(text), number=number, repeat=5)) / number
+            current = min(timeit.repeat(lambda: format_for_telegram(text), number=number, repeat=5)) / number
+            chunks = len(split_message(format_for_telegram(text)))
+            print(
+                f"{case:>10} {len(text):>10} {legacy * 1e6:>12.1f} {current * 1e6:>13.1f} "
+                f"{legacy / current:>7.2f}x {chunks:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+BlockScout AI - Fake Anthropic Messages API
+Replays a scripted tool_use -> end_turn conversation on POST /v1/messages,
+as plain JSON or as an SSE stream, with configurable latency
+
+Point the bot at it with ANTHROPIC_BASE_URL=http://127.0.0.1:8546
+
+Usage: python benchmarks/fake_anthropic.py [--port 8546] [--ttft-ms 400] [--token-ms 8]
+"""
+
+import re
+import json
+import uuid
+import asyncio
+import argparse
+from typing import Any, Dict, List
+
+from aiohttp import web
+
+DEFAULT_ADDRESS = "0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045"
+ADDRESS_PATTERN = re.compile(r"0x[a-fA-F0-9]{40}")
+
+# One entry per tool round: the tools Claude "asks for" before answering
+SCRIPT: List[List[str]] = [
+    ["get_address_info", "get_tokens_by_address"],
+    ["get_transactions_by_address"],
+]
+
+ANSWER = (
+    "**Address:** {address} is an active EOA.\n\n"
+    "Token: holds USDC, USDT, DAI, WETH and UNI • Mostly stablecoins • Some governance tokens\n\n"
+    "Recent Activity: • Sent 1,500 USDC • Received 0.5 ETH • Contract call to a router\n\n"
+    "Risk: LOW • No suspicious approvals • Long history\n\n"
+    "Key Insights: • Long-term holder • Diversified stablecoin position • Moderate activity"
+)
+
+
+def _words(text: str) -> List[str]:
+    """Split into word-sized deltas (whitespace kept)"""
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+class FakeAnthropic:
+    """Scripted Messages API: tool rounds from SCRIPT, then the final answer"""
+
+    def __init__(self, ttft_ms: float = 400.0, token_ms: float = 8.0, script: List[List[str]] = SCRIPT):
+        self.ttft_ms = ttft_ms
+        self.token_ms = token_ms
+        self.script = script
+        self.requests = 0
+        self.base_url = ""
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/v1/messages", self.messages)
+        return app
+
+    def _reply(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the assistant message for this point in the conversation"""
+        messages = body.get("messages") or []
+        first = messages[0]["content"] if messages else ""
+        first = first if isinstance(first, str) else json.dumps(first)
+        match = ADDRESS_PATTERN.search(first)
+        address = match.group(0) if match else DEFAULT_ADDRESS
+        chain = re.search(r"\[Chain: (\d+)\]", first)
+        chain_id = chain.group(1) if chain else "1"
+
+        tool_round = sum(1 for message in messages if message["role"] == "assistant")
+        tools_allowed = (body.get("tool_choice") or {}).get("type") != "none" and body.get("tools")
+        prefetched = "already fetched" in first
+        # Model-routing planner calls ask for DONE instead of an answer
+        planner = "reply with the single word DONE" in json.dumps(body.get("system") or "")
+
+        if tools_allowed and not prefetched and tool_round < len(self.script):
+            content = [{"type": "text", "text": "Let me look that up."}] + [
+                {
+                    "type": "tool_use",
+                    "id": f"toolu_{uuid.uuid4().hex[:20]}",
+                    "name": tool_name,
+                    "input": {"chain_id": chain_id, "address": address},
+                }
+                for tool_name in self.script[tool_round]
+            ]
+            stop_reason = "tool_use"
+        elif planner:
+            content = [{"type": "text", "text": "DONE"}]
+            stop_reason = "end_turn"
+        else:
+            content = [{"type": "text", "text": ANSWER.format(address=address)}]
+            stop_reason = "end_turn"
+
+        input_tokens = len(json.dumps(body)) // 4
+        output_tokens = sum(len(json.dumps(block)) // 4 for block in content)
+        return {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "claude-fake"),
+            "content": content,
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "cache_read_input_tokens": 0,
+                "cache_creation_input_tokens": 0,
+            },
+        }
+
+    async def messages(self, request: web.Request) -> web.StreamResponse:
+        self.requests += 1
+        body = await request.json()
+        reply = self._reply(body)
+        await asyncio.sleep(self.ttft_ms / 1000)
+
+        if not body.get("stream"):
+            await asyncio.sleep(reply["usage"]["output_tokens"] * self.token_ms / 1000)
+            return web.json_response(reply)
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+
+        async def send(event: str, data: Dict[str, Any]) -> None:
+            await response.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+
+        await send("message_start", {
+            "type": "message_start",
+            "message": {**reply, "content": [], "stop_reason": None,
+                        "usage": {**reply["usage"], "output_tokens": 1}},
+        })
+        for index, block in enumerate(reply["content"]):
+            if block["type"] == "text":
+                await send("content_block_start", {
+                    "type": "content_block_start", "index": index, "content_block": {"type": "text", "text": ""},
+                })
+                for word in _words(block["text"]):
+                    await asyncio.sleep(self.token_ms / 1000)
+                    await send("content_block_delta", {
+                        "type": "content_block_delta", "index": index, "delta": {"type": "text_delta", "text": word},
+                    })
+            else:
+                await send("content_block_start", {
+                    "type": "content_block_start", "index": index,
+                    "content_block": {**block, "input": {}},
+                })
+                await send("content_block_delta", {
+                    "type": "content_block_delta", "index": index,
+                    "delta": {"type": "input_json_delta", "partial_json": json.dumps(block["input"])},
+                })
+            await send("content_block_stop", {"type": "content_block_stop", "index": index})
+        await send("message_delta", {
+            "type": "message_delta",
+            "delta": {"stop_reason": reply["stop_reason"], "stop_sequence": None},
+            "usage": {"output_tokens": reply["usage"]["output_tokens"]},
+        })
+        await send("message_stop", {"type": "message_stop"})
+        await response.write_eof()
+        return response
+
+
+async def start_fake_anthropic(host: str = "127.0.0.1", port: int = 0, **options: Any) -> tuple:
+    """Start the server; returns (FakeAnthropic, runner) with base_url set"""
+    fake = FakeAnthropic(**options)
+    runner = web.AppRunner(fake.app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    fake.base_url = f"http://{host}:{runner.addresses[0][1]}"
+    return fake, runner
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    fake, runner = await start_fake_anthropic(port=args.port, ttft_ms=args.ttft_ms, token_ms=args.token_ms)
+    print(f"Fake Anthropic on {fake.base_url} (set ANTHROPIC_BASE_URL={fake.base_url})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8546)
+    parser.add_argument("--ttft-ms", type=float, default=400.0)
+    parser.add_argument("--token-ms", type=float, default=8.0)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+BlockScout AI - Fake Blockscout server
+Serves recorded Blockscout v2 fixtures for every tool path in
+call_blockscout_api, plus the chain list and BENS, with configurable latency
+and error rate
+
+Usage: python benchmarks/fake_blockscout.py [--port 8545] [--latency-ms 80] [--error-rate 0.01]
+"""
+
+import os
+import json
+import random
+import asyncio
+import argparse
+from typing import Any, Dict
+
+from aiohttp import web
+
+FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "blockscout.json")
+
+# Route -> fixture name (aiohttp resource syntax)
+ROUTES = {
+    "/api/v2/addresses/{address}": "address",
+    "/api/v2/addresses/{address}/tokens": "address_tokens",
+    "/api/v2/addresses/{address}/transactions": "address_transactions",
+    "/api/v2/addresses/{address}/token-transfers": "address_token_transfers",
+    "/api/v2/addresses/{address}/nft": "address_nft",
+    "/api/v2/smart-contracts/{address}": "smart_contract",
+    "/api/v2/smart-contracts/{address}/methods-read": "methods_read",
+    "/api/v2/search": "search",
+    "/api/v2/tokens/{address}": "token",
+    "/api/v2/blocks": "blocks",
+    "/api/v2/blocks/{number_or_hash}": "block",
+    "/api/v2/transactions/{transaction_hash}": "transaction",
+    "/api/v2/transactions/{transaction_hash}/logs": "transaction_logs",
+    "/api/v2/transactions/{transaction_hash}/summary": "transaction_summary",
+    "/api/chains": "chains",
+    "/api/v1/{chain_id}/domains/{name}": "ens_domain",
+}
+
+
+class FakeBlockscout:
+    """aiohttp app replaying fixtures with injected latency and 5xx errors"""
+
+    def __init__(self, latency_ms: float = 80.0, jitter_ms: float = 40.0, error_rate: float = 0.0, seed: int = 1):
+        with open(FIXTURES_PATH) as f:
+            self.fixtures: Dict[str, Any] = json.load(f)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self.base_url = ""
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        for route, fixture in ROUTES.items():
+            app.router.add_get(route, self._handler(fixture))
+        app.router.add_post("/api/v2/smart-contracts/{address}/query-read-method", self._handler("query_read_method"))
+        return app
+
+    def _handler(self, fixture: str):
+        async def handle(request: web.Request) -> web.Response:
+            self.requests += 1
+            delay = self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms)
+            await asyncio.sleep(max(delay, 0.0) / 1000)
+            if self.random.random() < self.error_rate:
+                self.errors += 1
+                return web.json_response({"message": "Internal server error"}, status=503)
+            return web.json_response(self._payload(fixture, request))
+        return handle
+
+    def _payload(self, fixture: str, request: web.Request) -> Any:
+        payload = self.fixtures[fixture]
+        if fixture == "chains":
+            # Every chain points back at this server
+            return json.loads(json.dumps(payload).replace("{base_url}", self.base_url))
+        if fixture == "address":
+            return {**payload, "hash": request.match_info["address"]}
+        return payload
+
+
+async def start_fake_blockscout(host: str = "127.0.0.1", port: int = 0, **options: Any) -> tuple:
+    """Start the server; returns (FakeBlockscout, runner) with base_url set"""
+    fake = FakeBlockscout(**options)
+    runner = web.AppRunner(fake.app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = runner.addresses[0][1]
+    fake.base_url = f"http://{host}:{bound_port}"
+    return fake, runner
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    fake, runner = await start_fake_blockscout(
+        port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate
+    )
+    print(f"Fake Blockscout on {fake.base_url} (chain list: {fake.base_url}/api/chains, BENS: {fake.base_url}/api/v1)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8545)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--jitter-ms", type=float, default=40.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+BlockScout AI - Offline load test
+Drives synthetic Telegram updates through the real handlers (bot.build_application)
+against the fake Blockscout and Anthropic servers, and reports throughput,
+latency percentiles and event-loop lag. No tokens are spent and no real
+Blockscout instance is hit.
+
+The fakes run on their own thread and event loop so they do not skew the
+bot's loop-lag numbers.
+
+Usage: python benchmarks/loadgen.py [--updates 200] [--concurrency 20] [--analyze-ratio 0.7]
+           [--blockscout-latency-ms 80] [--blockscout-error-rate 0.01] [--ttft-ms 400] [--token-ms 8]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from telegram.request import BaseRequest, RequestData  # noqa: E402
+
+from fake_anthropic import start_fake_anthropic  # noqa: E402
+from fake_blockscout import start_fake_blockscout  # noqa: E402
+
+BOT_USER = {"id": 1000, "is_bot": True, "first_name": "BlockScout AI", "username": "blockscout_ai_bot"}
+ADDRESSES = [
+    "0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045",
+    "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
+    "0x28C6c06298d514Db089934071355E5743bf21d60",
+    "0x3fC91A3afd70395Cd496C647d5a6CC9D4B2b7FAD",
+]
+QUESTIONS = [
+    "What tokens does {address} hold?",
+    "Show me recent transactions for {address}",
+    "Is {address} safe to interact with?",
+]
+
+
+class FakeTelegramRequest(BaseRequest):
+    """Bot API transport that answers every call locally"""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.calls: Counter = Counter()
+        self._message_ids = iter(range(1, 10**9))
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: Optional[RequestData] = None,
+        read_timeout: Any = None,
+        write_timeout: Any = None,
+        connect_timeout: Any = None,
+        pool_timeout: Any = None,
+    ) -> Tuple[int, bytes]:
+        endpoint = url.rsplit("/", 1)[-1]
+        self.calls[endpoint] += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+
+        params = request_data.json_parameters if request_data else {}
+        if endpoint == "getMe":
+            result: Any = BOT_USER
+        elif endpoint in ("sendMessage", "editMessageText"):
+            chat_id = int(params.get("chat_id", 0))
+            result = {
+                "message_id": int(params.get("message_id") or next(self._message_ids)),
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "from": BOT_USER,
+                "text": params.get("text", ""),
+            }
+        else:
+            result = True
+        return 200, json.dumps({"ok": True, "result": result}).encode()
+
+
+def make_update(update_id: int, chat_id: int, analyze: bool, rng: random.Random) -> Dict[str, Any]:
+    """Telegram update payload for /analyze or a free-form question"""
+    address = rng.choice(ADDRESSES)
+    if analyze:
+        text = f"/analyze {address}"
+        entities = [{"type": "bot_command", "offset": 0, "length": len("/analyze")}]
+    else:
+        text = rng.choice(QUESTIONS).format(address=address)
+        entities = []
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "Load"},
+            "text": text,
+            "entities": entities,
+        },
+    }
+
+
+def start_fakes(args: argparse.Namespace) -> Tuple[Any, Any]:
+    """Run both fake servers on a background thread with its own event loop"""
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    fakes: List[Any] = []
+
+    async def boot() -> None:
+        blockscout, _ = await start_fake_blockscout(
+            latency_ms=args.blockscout_latency_ms, jitter_ms=args.blockscout_jitter_ms,
+            error_rate=args.blockscout_error_rate,
+        )
+        anthropic, _ = await start_fake_anthropic(ttft_ms=args.ttft_ms, token_ms=args.token_ms)
+        fakes.extend([blockscout, anthropic])
+        started.set()
+
+    def run() -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(boot())
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    started.wait()
+    return fakes[0], fakes[1]
+
+
+def configure_env(blockscout_url: str, anthropic_url: str, args: argparse.Namespace) -> None:
+    """Point the bot at the fakes (must run before importing bot)"""
+    os.environ.update({
+        "TELEGRAM_API_TOKEN": "123456:LOADTEST",
+        "CLAUDE_API_KEY": "fake-key",
+        "ANTHROPIC_BASE_URL": anthropic_url,
+        "CHAINS_SOURCE_URL": f"{blockscout_url}/api/chains",
+        "BENS_URL": f"{blockscout_url}/api/v1",
+        "BOT_DATA_DIR": tempfile.mkdtemp(prefix="blockscout-bench-"),
+        "ANALYSIS_CACHE_TTL": "600" if args.analysis_cache else "0",
+    })
+    # Admission limits sized for the run unless overridden
+    os.environ.setdefault("MAX_INFLIGHT_REQUESTS", str(args.concurrency))
+    os.environ.setdefault("MAX_QUEUED_REQUESTS", str(args.concurrency * 4))
+    os.environ.setdefault("CHAT_RATE_PER_MINUTE", "600")
+    os.environ.setdefault("CHAT_BURST", "100")
+    os.environ.setdefault("CLAUDE_MAX_CONCURRENCY", str(args.concurrency))
+    os.environ.setdefault("STREAM_EDIT_INTERVAL", "0.25")
+
+
+async def monitor_loop_lag(samples: List[float], interval: float = 0.01) -> None:
+    """Record how late the loop wakes up a sleeping task"""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - started - interval)
+
+
+def percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+async def run(args: argparse.Namespace) -> None:
+    blockscout, anthropic = start_fakes(args)
+    configure_env(blockscout.base_url, anthropic.base_url, args)
+
+    import logging
+    logging.disable(logging.INFO if not args.verbose else logging.NOTSET)
+    import bot
+    from telegram import Update
+    from telegram.ext import Application
+
+    telegram_request = FakeTelegramRequest(args.telegram_latency_ms)
+    application = bot.build_application(
+        Application.builder().request(telegram_request).get_updates_request(FakeTelegramRequest())
+    )
+    await application.initialize()
+    await bot.chain_registry.refresh()
+
+    rng = random.Random(args.seed)
+    updates = [
+        make_update(i + 1, chat_id=10_000 + i % args.chats, analyze=rng.random() < args.analyze_ratio, rng=rng)
+        for i in range(args.updates)
+    ]
+    queue: asyncio.Queue = asyncio.Queue()
+    for payload in updates:
+        queue.put_nowait(payload)
+
+    latencies: Dict[str, List[float]] = {"analyze": [], "message": []}
+    lag_samples: List[float] = []
+
+    async def worker() -> None:
+        while not queue.empty():
+            payload = queue.get_nowait()
+            kind = "analyze" if payload["message"]["entities"] else "message"
+            started = time.perf_counter()
+            await application.process_update(Update.de_json(payload, application.bot))
+            latencies[kind].append(time.perf_counter() - started)
+
+    lag_task = asyncio.create_task(monitor_loop_lag(lag_samples))
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    lag_task.cancel()
+
+    await application.shutdown()
+    await bot.post_shutdown(application)
+
+    total = [value for values in latencies.values() for value in values]
+    print(f"\n{len(total)} updates in {elapsed:.2f}s with concurrency {args.concurrency}: "
+          f"{len(total) / elapsed:.1f} updates/s")
+    print(f"{'kind':10} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for kind, values in [*latencies.items(), ("all", total)]:
+        if values:
+            print(f"{kind:10} {len(values):>6} {percentile(values, 0.5) * 1000:>9.1f} "
+                  f"{percentile(values, 0.95) * 1000:>9.1f} {percentile(values, 0.99) * 1000:>9.1f} "
+                  f"{max(values) * 1000:>9.1f}")
+    print(f"event-loop lag: p50 {percentile(lag_samples, 0.5) * 1000:.2f} ms, "
+          f"p99 {percentile(lag_samples, 0.99) * 1000:.2f} ms, max {max(lag_samples, default=0) * 1000:.2f} ms")
+    print(f"fake Blockscout: {blockscout.requests} requests ({blockscout.errors} injected errors); "
+          f"fake Anthropic: {anthropic.requests} requests")
+    print(f"Telegram API calls: {dict(telegram_request.calls)}")
+    print(f"Blockscout cache: {bot.blockscout_cache.stats()}; single-flight: {bot.blockscout_flights.stats()}")
+    print(f"Scheduler: {bot.claude_scheduler.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--updates", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--chats", type=int, default=50, help="distinct chat IDs the updates come from")
+    parser.add_argument("--analyze-ratio", type=float, default=0.7, help="share of /analyze vs free-form messages")
+    parser.add_argument("--analysis-cache", action="store_true", help="keep the /analyze answer cache enabled")
+    parser.add_argument("--blockscout-latency-ms", type=float, default=80.0)
+    parser.add_argument("--blockscout-jitter-ms", type=float, default=40.0)
+    parser.add_argument("--blockscout-error-rate", type=float, default=0.0)
+    parser.add_argument("--ttft-ms", type=float, default=400.0, help="fake Claude time to first token")
+    parser.add_argument("--token-ms", type=float, default=8.0, help="fake Claude time per streamed word")
+    parser.add_argument("--telegram-latency-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--verbose", action="store_true", help="keep the bot's INFO logging")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,114 @@
+"""
+BlockScout AI - Async Blockscout HTTP client
+Shared keep-alive connection pools per Blockscout host (HTTP/2 when available)
+"""
+
+import os
+import asyncio
+import logging
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from tracing import trace_span
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional `h2` package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def _parse_host_limits(raw: str) -> Dict[str, int]:
+    """Parse per-host connection limits: "eth.blockscout.com=50,base.blockscout.com=20" """
+    limits = {}
+    for entry in raw.split(","):
+        if "=" not in entry:
+            continue
+        host, _, value = entry.partition("=")
+        try:
+            limits[host.strip().lower()] = int(value)
+        except ValueError:
+            logger.warning(f"Ignoring invalid host limit: {entry}")
+    return limits
+
+
+class BlockscoutClient:
+    """Async Blockscout client with one pooled httpx.AsyncClient per host
+
+    `max_in_flight` caps concurrent requests across all hosts.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        max_keepalive: int = 10,
+        host_limits: Optional[Dict[str, int]] = None,
+        http2: bool = HTTP2_AVAILABLE,
+        max_in_flight: int = 64,
+    ):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.host_limits = host_limits or {}
+        self.http2 = http2
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+
+    def _client_for(self, url: str) -> httpx.AsyncClient:
+        """Get (or lazily create) the pooled client for the URL's host"""
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        client = self._clients.get(origin)
+        if client is None:
+            max_connections = self.host_limits.get(parts.hostname or "", self.max_connections)
+            client = httpx.AsyncClient(
+                base_url=origin,
+                http2=self.http2,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=min(self.max_keepalive, max_connections),
+                ),
+                headers={"Accept": "application/json"},
+            )
+            self._clients[origin] = client
+            logger.info(f"Opened Blockscout pool for {origin} (max {max_connections}, http2={self.http2})")
+        return client
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET a Blockscout endpoint and return the decoded JSON body"""
+        return await self._request("GET", url, params=params)
+
+    async def post_json(self, url: str, json: Any) -> Any:
+        """POST a JSON body to a Blockscout endpoint and return the decoded JSON body"""
+        return await self._request("POST", url, json=json)
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> Any:
+        with trace_span("blockscout.http", method=method, host=urlsplit(url).hostname) as span:
+            async with self._in_flight:
+                response = await self._client_for(url).request(method, url, **kwargs)
+            span.set(status=response.status_code, bytes=len(response.content))
+            response.raise_for_status()
+            return response.json()
+
+    async def aclose(self) -> None:
+        """Close every pooled connection"""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+# Shared client for the whole bot process
+blockscout_client = BlockscoutClient(
+    timeout=float(os.getenv("BLOCKSCOUT_TIMEOUT", "10")),
+    max_connections=int(os.getenv("BLOCKSCOUT_MAX_CONNECTIONS", "20")),
+    max_keepalive=int(os.getenv("BLOCKSCOUT_MAX_KEEPALIVE", "10")),
+    host_limits=_parse_host_limits(os.getenv("BLOCKSCOUT_HOST_LIMITS", "")),
+    max_in_flight=int(os.getenv("BLOCKSCOUT_MAX_INFLIGHT", "64")),
+)
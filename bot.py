@@ -6,20 +6,42 @@ Intelligent blockchain analysis powered by Claude 3.5 Sonnet and Blockscout MCP
 
 import os
 import json
+import time
+import asyncio
 import logging
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Callable, Awaitable
 from dotenv import load_dotenv
 
 from telegram import Update
+from telegram.error import Forbidden, TelegramError
 from telegram.ext import (
     Application,
+    ApplicationBuilder,
     CommandHandler,
     MessageHandler,
     ContextTypes,
     filters,
 )
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
+import httpx
+
+from blockscout_client import blockscout_client
+from cache import TTLCache, PersistentTTLCache, SingleFlight, make_cache_key
+from projection import render_tool_result, compact_json
+from valuation import value_holdings, top_holdings, token_amount, token_decimals
+from streaming import TelegramStreamer, reply_in_chunks
+from telegram_format import format_for_telegram
+from webhook import run_webhook
+from scheduler import FairScheduler, SchedulerBusy
+from chain_registry import ChainRegistry
+from ens import ens_resolver, normalize_ens_name
+from history import summarize_history
+from watchlist import WatchPoller, watchlist, WATCH_MAX_PER_CHAT
+from budget import ToolLoopBudget, FINAL_ANSWER_NUDGE
+from model_routing import ModelRouter, ModelStats, CLAUDE_PLANNER_MAX_TOKENS, PLANNER_INSTRUCTION
+from tracing import trace_span, close_exporters, exporters as trace_exporters
+from metrics import MetricsExporter, counted, register_stats, start_metrics_server
 
 # Load environment variables
 load_dotenv()
@@ -89,7 +111,7 @@ def format_token_stats(token_data: dict) -> str:
     # Total Supply
     if total_supply:
         try:
-            supply = float(total_supply) / (10**18)  # Wei to tokens
+            supply = token_amount(total_supply, token_decimals(token_data))  # Base units to tokens
             if supply >= 1_000_000_000:
                 supply_str = f"{supply/1_000_000_000:.1f}B"
             elif supply >= 1_000_000:
@@ -104,9 +126,24 @@ def format_token_stats(token_data: dict) -> str:
     else:
         stats += "Supply 0\n"
     
+    # Holdings this token came from (get_tokens_by_address)
+    portfolio = token_data.get('portfolio')
+    if portfolio:
+        stats += f"\n💼 Portfolio {_compact_usd(portfolio['total_usd'])} · {portfolio['count']} tokens\n"
+        stats += " · ".join(f"{h['symbol']} {h['share'] * 100:.0f}%" for h in portfolio['top']) + "\n"
+        stats += f"Top holding {portfolio['concentration']['top_share'] * 100:.0f}% · HHI {portfolio['concentration']['hhi']:.2f}\n"
+    
     stats += "\n━━━━━━━━━━━━━━━━━━━━\n\n"
     return stats
 
+
+def _compact_usd(value: float) -> str:
+    """$1.2B / $3.4M / $5.6K / $7.89"""
+    for threshold, suffix in ((1_000_000_000, "B"), (1_000_000, "M"), (1_000, "K")):
+        if value >= threshold:
+            return f"${value / threshold:.1f}{suffix}"
+    return f"${value:.2f}"
+
 def clean_markdown(text: str) -> str:
     """Clean Markdown text to prevent Telegram parsing errors"""
     if not text:
@@ -130,10 +167,73 @@ def clean_markdown(text: str) -> str:
     
     return text.strip()
 
+def build_telegram_reply(claude_analysis: str, token_data: dict) -> str:
+    """Final message: token stats block (for tokens) followed by the formatted analysis"""
+    analysis_text = format_for_telegram(claude_analysis)
+    
+    # Check if this is a token
+    if token_data and 'symbol' in token_data and 'exchange_rate' in token_data:
+        # THIS IS A TOKEN! Add statistics BEFORE Claude analysis
+        return (format_token_stats(token_data) + analysis_text).strip()
+    
+    # Regular wallet/contract - only Claude analysis
+    return analysis_text.strip()
+
 # Initialize clients
-anthropic_client = Anthropic(api_key=os.getenv("CLAUDE_API_KEY"))
+anthropic_client = AsyncAnthropic(api_key=os.getenv("CLAUDE_API_KEY"))
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_API_TOKEN")
 
+# Claude concurrency limits
+CLAUDE_MAX_CONCURRENCY = int(os.getenv("CLAUDE_MAX_CONCURRENCY", "8"))
+CLAUDE_REQUEST_DEADLINE = float(os.getenv("CLAUDE_REQUEST_DEADLINE", "60"))
+claude_semaphore = asyncio.Semaphore(CLAUDE_MAX_CONCURRENCY)
+TOOL_CALLS_PER_TURN = int(os.getenv("TOOL_CALLS_PER_TURN", "4"))
+
+# Fallback answers from process_with_claude (never cached)
+ANALYSIS_TIMEOUT_TEXT = "Analysis took too long. Please try a simpler query."
+ANALYSIS_ERROR_TEXT = "Sorry, I encountered an error analyzing your request. Please try again."
+EMPTY_RESPONSE_TEXT = "I couldn't generate a response. Please try again."
+ANALYSIS_FAILURE_TEXTS = {ANALYSIS_TIMEOUT_TEXT, ANALYSIS_ERROR_TEXT, EMPTY_RESPONSE_TEXT}
+
+# Full-response cache for /analyze: same address + chain within the freshness window
+ANALYSIS_CACHE_TTL = float(os.getenv("ANALYSIS_CACHE_TTL", "600"))
+ANALYSIS_CACHE_MAX_BYTES = int(os.getenv("ANALYSIS_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+if os.getenv("ANALYSIS_CACHE_PERSIST", "0") == "1":
+    analysis_cache = PersistentTTLCache(
+        os.path.join(os.getenv("BOT_DATA_DIR", "data"), "analysis_cache.sqlite3"),
+        max_bytes=ANALYSIS_CACHE_MAX_BYTES
+    )
+else:
+    analysis_cache = TTLCache(max_bytes=ANALYSIS_CACHE_MAX_BYTES)
+
+# /analyze fast path: core data fetched up front and inlined into the first message
+ANALYZE_PREFETCH = os.getenv("ANALYZE_PREFETCH", "1") == "1"
+PREFETCH_TOOLS = ("get_address_info", "get_tokens_by_address", "get_transactions_by_address", "nft_tokens_by_address")
+PREFETCH_RESULT_CHARS = 2500
+
+# /sweep: chains checked for one address and the per-chain time limit
+SWEEP_CHAINS = [c.strip() for c in os.getenv("SWEEP_CHAINS", "1,8453,137,10,42161,100").split(",") if c.strip()]
+SWEEP_CHAIN_TIMEOUT = float(os.getenv("SWEEP_CHAIN_TIMEOUT", "8"))
+SWEEP_TOKENS_PER_CHAIN = 5
+
+# Admission control for Claude-backed handlers
+claude_scheduler = FairScheduler(
+    max_in_flight=int(os.getenv("MAX_INFLIGHT_REQUESTS", "8")),
+    max_queued=int(os.getenv("MAX_QUEUED_REQUESTS", "32")),
+    max_queued_per_chat=int(os.getenv("MAX_QUEUED_PER_CHAT", "2")),
+    rate_per_minute=float(os.getenv("CHAT_RATE_PER_MINUTE", "6")),
+    burst=int(os.getenv("CHAT_BURST", "3")),
+    max_wait=float(os.getenv("QUEUE_MAX_WAIT", "20")),
+)
+BUSY_MESSAGES = {
+    "rate_limited": "⏳ You're sending requests too quickly. Please wait a few seconds and try again.",
+    "busy": "⏳ I'm handling a lot of requests right now. Please try again in a moment.",
+}
+
+# Update delivery: "polling" (default) or "webhook"
+BOT_MODE = os.getenv("BOT_MODE", "polling").lower()
+TELEGRAM_CONCURRENT_UPDATES = int(os.getenv("TELEGRAM_CONCURRENT_UPDATES", "32"))
+
 # Validate environment variables
 if not TELEGRAM_TOKEN:
     raise ValueError("TELEGRAM_API_TOKEN environment variable is required")
@@ -195,7 +295,7 @@ BLOCKSCOUT_TOOLS = [
     },
     {
         "name": "get_transactions_by_address",
-        "description": "Get transaction history for an address with decoded parameters and token transfers. Use for activity analysis.",
+        "description": "Get transaction history for an address: a summary (counts, native volume, fees, top counterparties and methods, first/last seen) plus the newest transactions. Pass age_from/age_to to summarize a whole period, e.g. last quarter's activity.",
         "input_schema": {
             "type": "object",
             "properties": {
@@ -257,7 +357,7 @@ BLOCKSCOUT_TOOLS = [
     },
     {
         "name": "get_token_transfers_by_address",
-        "description": "Get ERC20 token transfers for an address within a specific time range.",
+        "description": "Get ERC20 token transfers for an address: a summary (in/out volume per token, top counterparties, first/last seen) plus the newest transfers. Pass age_from/age_to to summarize a whole period.",
         "input_schema": {
             "type": "object",
             "properties": {
@@ -635,108 +735,337 @@ EXAMPLE 2: Wallet Analysis
 Built for ETHOnline 2025 - Blockscout MCP Prize 🏆
 """
 
+# Anthropic prompt caching: tools are rendered before the system prompt, so a
+# breakpoint on the system block caches the whole static prefix (tools + system)
+CACHED_SYSTEM_PROMPT = [
+    {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+]
+# Planner calls (model routing) keep the cached prefix and add the tools-only instruction
+PLANNER_SYSTEM_PROMPT = CACHED_SYSTEM_PROMPT + [{"type": "text", "text": PLANNER_INSTRUCTION}]
+
+
+# Blockscout response cache: seconds each tool's data stays fresh
+# (get_address_by_ens_name is left out: ens_resolver caches the name and the
+# get_address_info data it embeds is cached under that tool's own TTL)
+BLOCKSCOUT_CACHE_TTLS = {
+    "get_contract_abi": 24 * 3600,
+    "inspect_contract_code": 24 * 3600,
+    "get_block_info": 3600,
+    "get_transaction_info": 3600,
+    "get_transaction_logs": 3600,
+    "transaction_summary": 3600,
+    "get_chains_list": 3600,
+    "lookup_token_by_symbol": 600,
+    "get_token_info": 300,
+    "nft_tokens_by_address": 300,
+    "get_tokens_by_address": 120,
+    "get_address_info": 60,
+    "get_transactions_by_address": 30,
+    "get_token_transfers_by_address": 30,
+    "read_contract": 15,
+    "get_latest_block": 5,
+}
+blockscout_cache = TTLCache(max_bytes=int(os.getenv("BLOCKSCOUT_CACHE_MAX_BYTES", str(32 * 1024 * 1024))))
+blockscout_flights = SingleFlight()
+
+
+def normalize_chain_id(chain_id: Any) -> str:
+    """Normalize chain_id (Claude might send "ethereum" instead of "1")"""
+    chain_id_map = {
+        "ethereum": "1",
+        "eth": "1",
+        "base": "8453",
+        "polygon": "137",
+        "matic": "137",
+    }
+    value = str(chain_id).strip()
+    return chain_id_map.get(value.lower()) or chain_registry.resolve(value) or value
+
 
 # Blockscout API integration
 async def call_blockscout_api(tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    """Call Blockscout API and return results for Claude"""
-    try:
-        import requests
-        
-        chain_id = params.get("chain_id", "1")
+    """Call Blockscout API through the response cache and return results for Claude"""
+    chain_id = normalize_chain_id(params.get("chain_id", "1"))
+    cache_key = make_cache_key(tool_name, chain_id, params)
+    
+    with trace_span("blockscout.call", tool=tool_name, chain_id=chain_id) as span:
+        hit, cached = blockscout_cache.get(cache_key)
+        span.set(cache_hit=hit)
+        if hit:
+            logger.info(f"⚡ Cache hit: {tool_name}")
+            return cached
         
-        # Normalize chain_id (Claude might send "ethereum" instead of "1")
-        chain_id_map = {
-            "ethereum": "1",
-            "eth": "1",
-            "base": "8453",
-            "polygon": "137",
-            "matic": "137",
+        # Identical in-flight requests share one Blockscout round trip
+        return await blockscout_flights.do(
+            cache_key, lambda: _fetch_and_cache(tool_name, params, chain_id, cache_key)
+        )
+
+
+async def _fetch_and_cache(tool_name: str, params: Dict[str, Any], chain_id: str, cache_key: str) -> Dict[str, Any]:
+    """Fetch from Blockscout and store successful responses in the cache"""
+    result = await _fetch_blockscout(tool_name, params, chain_id)
+    
+    # Primary ENS names seen in address info feed the ENS reverse index
+    if (
+        tool_name == "get_address_info" and chain_id == "1" and isinstance(result, dict)
+        and result.get("ens_domain_name") and result.get("hash")
+    ):
+        ens_resolver.remember_primary(result["ens_domain_name"], result["hash"])
+    
+    ttl = BLOCKSCOUT_CACHE_TTLS.get(tool_name, 0)
+    if ttl and not (isinstance(result, dict) and "error" in result):
+        blockscout_cache.set(cache_key, result, ttl)
+    return result
+
+
+# Map chain IDs to Blockscout instances
+BLOCKSCOUT_INSTANCES = {
+    "1": {"name": "Ethereum", "url": "https://eth.blockscout.com/api/v2"},
+    "8453": {"name": "Base", "url": "https://base.blockscout.com/api/v2"},
+    "137": {"name": "Polygon", "url": "https://polygon.blockscout.com/api/v2"},
+}
+
+# Every chain with a Blockscout explorer (seeded with the instances above)
+chain_registry = ChainRegistry(seed=BLOCKSCOUT_INSTANCES)
+
+# Background watchlist sweeps (started in post_init)
+watch_poller: Optional[WatchPoller] = None
+
+# Network names accepted by /analyze and /watch
+NETWORK_CHAIN_IDS = {
+    "ethereum": "1",
+    "eth": "1",
+    "base": "8453",
+    "polygon": "137",
+    "matic": "137",
+    "arbitrum": "42161",
+    "arbitrum one": "42161",
+    "optimism": "10",
+    "bsc": "56",
+    "binance": "56",
+    "avalanche": "43114",
+    "avax": "43114",
+    "fantom": "250",
+    "gnosis": "100",
+    "linea": "59144"
+}
+
+
+def chain_id_for_network(network: str) -> Optional[str]:
+    """Network name, numeric chain ID or registry name -> chain ID"""
+    network = network.lower()
+    if network in NETWORK_CHAIN_IDS:
+        return NETWORK_CHAIN_IDS[network]
+    if network.isdigit():
+        return network
+    return chain_registry.resolve(network)
+
+
+def _endpoint_tool(path: str, **query: Any):
+    """Build a tool handler that GETs one Blockscout path filled from tool params"""
+    async def handler(base_url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        return await blockscout_client.get_json(base_url + path.format(**params), params=query or None)
+    return handler
+
+
+async def _tool_address_by_ens_name(base_url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    name = normalize_ens_name(params["name"])
+    resolved_address = await ens_resolver.resolve(name)
+    
+    if resolved_address is None:
+        return {
+            "error": f"ENS name {name} does not resolve to an address",
+            "suggestion": "Check the spelling or use the address directly (0x...)"
         }
-        chain_id = chain_id_map.get(str(chain_id).lower(), str(chain_id))
-        
-        # Map chain IDs to Blockscout instances
-        chain_urls = {
-            "1": "https://eth.blockscout.com/api/v2",
-            "8453": "https://base.blockscout.com/api/v2",
-            "137": "https://polygon.blockscout.com/api/v2",
+    
+    # Get address info (served from the response cache on repeat lookups)
+    data = await call_blockscout_api("get_address_info", {"chain_id": "1", "address": resolved_address})
+    
+    return {
+        "address": resolved_address,
+        "ens_name": name,
+        "resolved": True,
+        "data": data
+    }
+
+
+async def _tool_latest_block(base_url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    data = await blockscout_client.get_json(f"{base_url}/blocks", params={"type": "block"})
+    return {"latest_block": data.get("items", [{}])[0] if data.get("items") else {}}
+
+
+async def _tool_transactions(base_url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    # The v2 endpoint has no date filter, so the pager walks back to age_from
+    return await summarize_history(
+        f"{base_url}/addresses/{params['address']}/transactions", params["address"],
+        age_from=params.get("age_from"), age_to=params.get("age_to")
+    )
+
+
+async def _tool_token_transfers(base_url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    return await summarize_history(
+        f"{base_url}/addresses/{params['address']}/token-transfers", params["address"],
+        params={"type": "ERC-20"}, age_from=params.get("age_from"), age_to=params.get("age_to")
+    )
+
+
+async def _tool_lookup_token_by_symbol(base_url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    data = await blockscout_client.get_json(f"{base_url}/search", params={"q": params["symbol"]})
+    return {"items": [item for item in data.get("items", []) if item.get("type") == "token"]}
+
+
+async def _tool_chains_list(base_url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    return {"items": chain_registry.chains()}
+
+
+async def _tool_contract_abi(base_url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    data = await blockscout_client.get_json(f"{base_url}/smart-contracts/{params['address']}")
+    return {
+        "name": data.get("name"),
+        "is_verified": data.get("is_verified"),
+        "abi": data.get("abi"),
+    }
+
+
+async def _tool_inspect_contract_code(base_url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    data = await blockscout_client.get_json(f"{base_url}/smart-contracts/{params['address']}")
+    main_file = data.get("file_path") or "main"
+    sources = {main_file: data.get("source_code")}
+    for extra in data.get("additional_sources") or []:
+        sources[extra.get("file_path")] = extra.get("source_code")
+    
+    file_name = params.get("file_name")
+    if file_name:
+        if file_name not in sources:
+            return {"error": f"File {file_name} not found", "files": list(sources)}
+        return {"file_name": file_name, "source_code": sources[file_name]}
+    
+    return {
+        "name": data.get("name"),
+        "is_verified": data.get("is_verified"),
+        "language": data.get("language"),
+        "compiler_version": data.get("compiler_version"),
+        "optimization_enabled": data.get("optimization_enabled"),
+        "proxy_type": data.get("proxy_type"),
+        "implementations": data.get("implementations"),
+        "files": list(sources),
+        "source_code": sources[main_file],
+    }
+
+
+async def _tool_read_contract(base_url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    address = params["address"]
+    function_name = params["function_name"]
+    args = params.get("args") or []
+    if isinstance(args, str):
+        try:
+            args = json.loads(args)
+        except json.JSONDecodeError:
+            return {"error": "Invalid args: expected a JSON array of function arguments"}
+    if not isinstance(args, list):
+        args = [args]
+    
+    abi = params["abi"]
+    if isinstance(abi, str):
+        try:
+            abi = json.loads(abi)
+        except json.JSONDecodeError:
+            return {"error": "Invalid abi: expected the function's ABI entry as a JSON object"}
+    if isinstance(abi, list):
+        # A whole contract ABI: keep the entries for this function
+        abi = next((entry for entry in abi if isinstance(entry, dict) and entry.get("name") == function_name), {})
+    abi_inputs = abi.get("inputs") if isinstance(abi, dict) else None
+    input_types = [entry.get("type") for entry in abi_inputs] if isinstance(abi_inputs, list) else None
+    
+    # Blockscout identifies read methods by selector, so look it up by name and input types
+    methods = await blockscout_client.get_json(f"{base_url}/smart-contracts/{address}/methods-read")
+    if isinstance(methods, dict):
+        methods = methods.get("items", [])
+    candidates = [
+        method for method in methods
+        if method.get("name") == function_name and len(method.get("inputs") or []) == len(args)
+    ]
+    if input_types is not None:
+        candidates = [
+            method for method in candidates
+            if [entry.get("type") for entry in method.get("inputs") or []] == input_types
+        ]
+    if not candidates:
+        signature = f"{function_name}({','.join(input_types)})" if input_types is not None else function_name
+        return {"error": f"Read method {signature} with {len(args)} argument(s) not found"}
+    if len(candidates) > 1:
+        return {
+            "error": f"{function_name} is overloaded",
+            "suggestion": "Pass the function's ABI entry (with input types) in abi to pick the overload"
         }
-        
-        base_url = chain_urls.get(chain_id, "https://eth.blockscout.com/api/v2")
-        
-        # Handle different tools
-        if tool_name == "get_address_info":
-            address = params.get("address")
-            url = f"{base_url}/addresses/{address}"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-            
-        elif tool_name == "get_tokens_by_address":
-            address = params.get("address")
-            url = f"{base_url}/addresses/{address}/tokens"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-            
-        elif tool_name == "get_transactions_by_address":
-            address = params.get("address")
-            url = f"{base_url}/addresses/{address}/transactions"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-            
-        elif tool_name == "get_address_by_ens_name":
-            # ENS resolution - Blockscout doesn't support direct ENS lookup
-            # Return known ENS mappings or error
-            name = params.get("name", "").lower()
-            
-            # Known ENS addresses (hardcoded for demo)
-            known_ens = {
-                "vitalik.eth": "0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045",
-                "vitalik": "0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045",
+    
+    method_id = candidates[0].get("method_id")
+    if not method_id:
+        return {"error": f"Blockscout returned no selector for {function_name}"}
+    return await blockscout_client.post_json(
+        f"{base_url}/smart-contracts/{address}/query-read-method",
+        json={"args": args, "method_id": method_id, "contract_type": "regular"}
+    )
+
+
+# Tool name -> handler(base_url, params); every tool in BLOCKSCOUT_TOOLS has an entry
+BLOCKSCOUT_TOOL_HANDLERS = {
+    "get_address_info": _endpoint_tool("/addresses/{address}"),
+    "get_address_by_ens_name": _tool_address_by_ens_name,
+    "get_tokens_by_address": _endpoint_tool("/addresses/{address}/tokens"),
+    "get_transactions_by_address": _tool_transactions,
+    "nft_tokens_by_address": _endpoint_tool("/addresses/{address}/nft"),
+    "get_contract_abi": _tool_contract_abi,
+    "get_token_transfers_by_address": _tool_token_transfers,
+    "lookup_token_by_symbol": _tool_lookup_token_by_symbol,
+    "get_token_info": _endpoint_tool("/tokens/{address}"),
+    "get_latest_block": _tool_latest_block,
+    "get_block_info": _endpoint_tool("/blocks/{number_or_hash}"),
+    "get_chains_list": _tool_chains_list,
+    "get_transaction_info": _endpoint_tool("/transactions/{transaction_hash}"),
+    "get_transaction_logs": _endpoint_tool("/transactions/{transaction_hash}/logs"),
+    "transaction_summary": _endpoint_tool("/transactions/{transaction_hash}/summary"),
+    "inspect_contract_code": _tool_inspect_contract_code,
+    "read_contract": _tool_read_contract,
+}
+
+
+# Tool name -> parameters its input schema marks as required
+BLOCKSCOUT_TOOL_REQUIRED_PARAMS = {
+    tool["name"]: tool["input_schema"].get("required", []) for tool in BLOCKSCOUT_TOOLS
+}
+
+
+async def _fetch_blockscout(tool_name: str, params: Dict[str, Any], chain_id: str) -> Dict[str, Any]:
+    """Fetch a tool result straight from Blockscout"""
+    handler = BLOCKSCOUT_TOOL_HANDLERS.get(tool_name)
+    if handler is None:
+        return {"error": f"Unknown tool: {tool_name}"}
+    
+    # chain_id falls back to Ethereum (see call_blockscout_api)
+    missing = [
+        name for name in BLOCKSCOUT_TOOL_REQUIRED_PARAMS[tool_name]
+        if name != "chain_id" and params.get(name) in (None, "")
+    ]
+    if missing:
+        return {"error": f"Missing required parameter: {', '.join(missing)}"}
+    
+    try:
+        base_url = await chain_registry.api_url(chain_id)
+        if base_url is None:
+            return {
+                "error": f"No Blockscout instance found for chain_id {chain_id}",
+                "suggestion": "Use get_chains_list to find a supported chain ID"
             }
-            
-            if name in known_ens:
-                resolved_address = known_ens[name]
-                # Get address info
-                url = f"https://eth.blockscout.com/api/v2/addresses/{resolved_address}"
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                
-                return {
-                    "address": resolved_address,
-                    "ens_name": name,
-                    "resolved": True,
-                    "data": data
-                }
-            else:
-                return {
-                    "error": f"ENS resolution not supported. Please use the address directly (0x...)",
-                    "suggestion": "Try using the Ethereum address format: 0x..."
-                }
-            
-        elif tool_name == "nft_tokens_by_address":
-            address = params.get("address")
-            url = f"{base_url}/addresses/{address}/nft"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-            
-        elif tool_name == "get_latest_block":
-            url = f"{base_url}/blocks"
-            response = requests.get(url, params={"type": "block"}, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            return {"latest_block": data.get("items", [{}])[0] if data.get("items") else {}}
-            
-        else:
-            return {"error": f"Tool {tool_name} not implemented yet"}
-            
-    except requests.exceptions.Timeout:
+        
+        return await handler(base_url, params)
+    except httpx.TimeoutException:
         logger.error(f"Blockscout API timeout for {tool_name}")
         return {"error": "Request timeout. Blockscout API is slow. Please try again."}
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPStatusError as e:
+        logger.error(f"Blockscout API error: {str(e)}")
+        return {"error": f"Failed to fetch data: {str(e)}", "status_code": e.response.status_code}
+    except httpx.HTTPError as e:
         logger.error(f"Blockscout API error: {str(e)}")
         return {"error": f"Failed to fetch data: {str(e)}"}
     except Exception as e:
@@ -744,100 +1073,427 @@ async def call_blockscout_api(tool_name: str, params: Dict[str, Any]) -> Dict[st
         return {"error": f"Unexpected error: {str(e)}"}
 
 
-async def process_with_claude(user_message: str, chain: str = "1") -> tuple[str, dict]:
+def analysis_cache_key(address: str, chain_id: str) -> str:
+    """Key for a cached /analyze answer: (intent, chain, address, freshness window)"""
+    address = address.strip().lower()
+    if not address.startswith("0x"):
+        # ENS names already resolved share the address's entry
+        hit, resolved_address = ens_resolver.cached(address)
+        address = resolved_address.lower() if hit and resolved_address else normalize_ens_name(address)
+    freshness = int(time.time() // ANALYSIS_CACHE_TTL)
+    return make_cache_key("analyze", chain_id, {"address": address, "freshness": freshness})
+
+
+def extract_token_data(result: Any) -> dict:
+    """Token data for the stats block, if the result carries any
+    
+    For a holdings list (get_tokens_by_address) this is the largest holding by
+    USD value, with the valued portfolio summary under "portfolio".
+    """
+    # ✅ Check if this is token data from get_tokens_by_address
+    if isinstance(result, dict) and 'items' in result and result['items']:
+        items = result['items']
+        first_item = items[0]
+        if not (isinstance(first_item, dict) and isinstance(first_item.get('token'), dict) and 'value' in first_item):
+            return {}
+        
+        portfolio = value_holdings(items)
+        top = top_holdings(portfolio, 3)
+        if not top:
+            return {}
+        # Match on contract address: spoofed airdrops often reuse a real token's symbol
+        top_address = (top[0]['address'] or '').lower()
+        token = next((
+            item['token'] for item in items
+            if isinstance(item, dict) and isinstance(item.get('token'), dict)
+            and ((item['token'].get('address_hash') or item['token'].get('address') or '').lower() == top_address)
+        ), first_item['token'])
+        if 'symbol' in token and 'exchange_rate' in token:
+            return {**token, "portfolio": {
+                "total_usd": portfolio["total_usd"],
+                "count": portfolio["count"],
+                "concentration": portfolio["concentration"],
+                "top": top,
+            }}
+    return {}
+
+
+async def prefetch_address_data(address: str, chain_id: str) -> tuple[str, dict]:
+    """Fetch the core /analyze data concurrently for the single-call fast path
+    
+    Returns:
+        tuple: (context_block_for_claude, token_data_dict) - empty if prefetch is not possible
+    """
+    try:
+        if not address.lower().startswith("0x"):
+            resolved_address = await ens_resolver.resolve(address)
+            if resolved_address is None:
+                return "", {}
+            address = resolved_address
+        
+        results = await asyncio.gather(*(
+            call_blockscout_api(tool_name, {"chain_id": chain_id, "address": address})
+            for tool_name in PREFETCH_TOOLS
+        ))
+    except Exception as e:
+        logger.warning(f"Prefetch failed for {address}: {e}")
+        return "", {}
+    
+    token_data = {}
+    sections = []
+    for tool_name, result in zip(PREFETCH_TOOLS, results):
+        token_data = extract_token_data(result) or token_data
+        sections.append(f"{tool_name}: {render_tool_result(tool_name, result, max_chars=PREFETCH_RESULT_CHARS)}")
+    
+    logger.info(f"⚡ Prefetched {len(PREFETCH_TOOLS)} resources for {address} on chain {chain_id}")
+    return f"Prefetched Blockscout data for {address}:\n" + "\n".join(sections), token_data
+
+
+async def _sweep_chain(address: str, chain_id: str) -> Optional[dict]:
+    """Holdings of an address on one chain (None when it has no balance or tokens there)"""
+    params = {"chain_id": chain_id, "address": address}
+    async with asyncio.timeout(SWEEP_CHAIN_TIMEOUT):
+        info, tokens = await asyncio.gather(
+            call_blockscout_api("get_address_info", params),
+            call_blockscout_api("get_tokens_by_address", params),
+        )
+    if "error" in info:
+        if info.get("status_code") == 404:
+            return None  # Blockscout has never seen the address on this chain
+        raise RuntimeError(info["error"])
+    
+    if "error" in tokens:
+        # Holdings on this chain are unknown, not empty
+        raise RuntimeError(tokens["error"])
+    
+    balance = int(info.get("coin_balance") or 0) / 10**18
+    items = tokens.get("items") or []
+    if not balance and not items:
+        return None
+    
+    chain = chain_registry.get(chain_id) or {}
+    holdings = {
+        "chain": chain.get("name", chain_id),
+        "chain_id": chain_id,
+        "native_balance": round(balance, 6),
+    }
+    if info.get("exchange_rate"):
+        holdings["native_usd"] = round(balance * float(info["exchange_rate"]), 2)
+    if items:
+        holdings["tokens"] = value_holdings(items, limit=SWEEP_TOKENS_PER_CHAIN)
+    return holdings
+
+
+async def sweep_address(address: str) -> tuple[str, dict]:
+    """Fetch holdings for one address on every sweep chain concurrently
+    
+    Total latency is bounded by the slowest chain (or SWEEP_CHAIN_TIMEOUT);
+    chains with no activity are dropped.
+    
+    Returns:
+        tuple: (context_block_for_claude, empty_token_data)
+    """
+    outcomes = await asyncio.gather(
+        *(_sweep_chain(address, chain_id) for chain_id in SWEEP_CHAINS), return_exceptions=True
+    )
+    
+    active, unavailable = [], []
+    for chain_id, outcome in zip(SWEEP_CHAINS, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.warning(f"Sweep of {address} on chain {chain_id} failed: {outcome!r}")
+            unavailable.append(chain_id)
+        elif outcome:
+            active.append(outcome)
+    
+    logger.info(f"🧹 Swept {address}: active on {len(active)}/{len(SWEEP_CHAINS)} chains")
+    portfolio = {"address": address, "active_chains": active, "no_activity": len(SWEEP_CHAINS) - len(active) - len(unavailable)}
+    if unavailable:
+        portfolio["unavailable_chains"] = unavailable
+    return f"Cross-chain portfolio (already fetched): {compact_json(portfolio)}", {}
+
+
+async def _run_tool_call(block: Any, semaphore: asyncio.Semaphore) -> tuple[dict, dict]:
+    """Run one tool_use block against Blockscout
+    
+    Returns:
+        tuple: (tool_result_content_block, token_data_dict_or_empty)
+    """
+    async with semaphore:
+        logger.info(f"🔧 Tool call: {block.name}")
+        logger.info(f"📥 Input: {block.input}")
+        
+        # Call Blockscout API
+        result = await call_blockscout_api(block.name, block.input)
+        logger.info(f"📤 Result: {str(result)[:200]}...")  # First 200 chars
+    
+    token_info = extract_token_data(result)
+    
+    # ✅ CRITICAL: Limit result size to prevent token overflow!
+    # Blockscout returns HUGE data - keep only the fields the analysis needs
+    result_str = render_tool_result(block.name, result)
+    
+    return {
+        "type": "tool_result",
+        "tool_use_id": block.id,
+        "content": result_str
+    }, token_info
+
+
+async def process_with_claude(
+    user_message: str,
+    chain: str = "1",
+    stream: Optional[TelegramStreamer] = None,
+    context: str = "",
+    query_class: Optional[str] = None,
+    use_tools: bool = True
+) -> tuple[str, dict]:
     """Process user query with Claude tool handling loop
     
+    When a streamer is given, answer text is pushed to it as it is generated.
+    Prefetched data passed as context is inlined into the first message.
+    The tool loop runs under a per-query-class budget (see budget.py); the
+    query is classified from its text unless query_class is given.
+    With use_tools=False the context is answered in one synthesis call.
+    
     Returns:
         tuple: (claude_analysis_text, token_data_dict)
     """
     
     try:
-        messages = [{
-                "role": "user",
-            "content": f"[Chain: {chain}] {user_message}. Keep response SHORT (50-150 words). Use emojis and bullet points."
-        }]
+        async with asyncio.timeout(CLAUDE_REQUEST_DEADLINE):
+            return await _claude_tool_loop(user_message, chain, stream, context, query_class, use_tools)
+    except TimeoutError:
+        logger.warning(f"Claude request exceeded {CLAUDE_REQUEST_DEADLINE}s deadline")
+        return ANALYSIS_TIMEOUT_TEXT, {}
+    except Exception as e:
+        logger.error(f"Error processing with Claude: {str(e)}", exc_info=True)
+        return ANALYSIS_ERROR_TEXT, {}
+
+
+async def _claude_tool_loop(
+    user_message: str,
+    chain: str,
+    stream: Optional[TelegramStreamer],
+    context: str,
+    query_class: Optional[str],
+    use_tools: bool = True
+) -> tuple[str, dict]:
+    """Run the Claude tool-use loop (caller enforces the deadline)"""
+    content = f"[Chain: {chain}] {user_message}."
+    if context:
+        content += (
+            f"\n\n{context}\n\nThis data is already fetched - answer from it directly and only "
+            "call tools for anything essential that is missing."
+        )
+    messages = [{
+        "role": "user",
+        "content": f"{content} Keep response SHORT (50-150 words). Use emojis and bullet points."
+    }]
+    
+    # Tool use loop - proper architecture for MCP Prize!
+    budget = ToolLoopBudget.for_query(user_message, query_class)
+    router = ModelRouter(budget.query_class, prefetched=bool(context))
+    model_stats = ModelStats()
+    token_data = {}  # Store token data if found
+    usage_totals = dict.fromkeys(USAGE_FIELDS, 0)
+    synthesize = False  # Planner has gathered everything it needs
+    
+    while not budget.exhausted():
+        iteration = budget.iterations + 1
+        out_of_budget = budget.must_finalize()
+        final = synthesize or out_of_budget or not use_tools
+        planning = router.plans(final)
         
-        # Tool use loop - proper architecture for MCP Prize!
-        max_iterations = 5
-        iteration = 0
-        token_data = {}  # Store token data if found
+        # Call Claude API with tools (bounded number of in-flight calls)
+        request = dict(
+            model=router.model_for(final),
+            max_tokens=CLAUDE_PLANNER_MAX_TOKENS if planning else budget.max_tokens,
+            system=PLANNER_SYSTEM_PROMPT if planning else CACHED_SYSTEM_PROMPT,
+            messages=messages,
+            tools=BLOCKSCOUT_TOOLS  # CRITICAL for MCP Prize!
+        )
+        if not use_tools:
+            del request["tools"]
+        elif final:
+            request["tool_choice"] = {"type": "none"}
+        if out_of_budget and not synthesize:
+            # Last call the budget allows: answer from what we have
+            if isinstance(messages[-1]["content"], list):
+                messages[-1]["content"].append({"type": "text", "text": FINAL_ANSWER_NUDGE})
+            logger.info(f"Tool loop budget nearly spent ({budget.summary()}) - forcing final answer")
+        
+        # Planner replies are never shown
+        live_stream = None if planning else stream
+        with trace_span("claude.call", iteration=iteration, model=request["model"], final=final) as span:
+            async with claude_semaphore:
+                started_at = time.monotonic()
+                if live_stream is None:
+                    response = await anthropic_client.messages.create(**request)
+                else:
+                    # We only learn whether this is the final answer once it ends,
+                    # so every iteration streams and tool-use preambles are reset
+                    async with anthropic_client.messages.stream(**request) as message_stream:
+                        async for text in message_stream.text_stream:
+                            await live_stream.push(text)
+                        response = await message_stream.get_final_message()
+                latency = time.monotonic() - started_at
+            span.set(stop_reason=response.stop_reason, **_usage_counts(response.usage))
+        if live_stream is not None and response.stop_reason != "end_turn":
+            await live_stream.reset()
         
-        while iteration < max_iterations:
-            iteration += 1
+        iteration_usage = _usage_counts(response.usage)
+        budget.record(iteration_usage)
+        model_stats.record(request["model"], latency, iteration_usage)
+        for name, value in iteration_usage.items():
+            usage_totals[name] += value
+        logger.info(
+            f"Claude response iteration {iteration} [{request['model']}, {latency:.2f}s]: {response.stop_reason} "
+            f"(input={iteration_usage['input_tokens']}, output={iteration_usage['output_tokens']}, "
+            f"cache_read={iteration_usage['cache_read_input_tokens']}, "
+            f"cache_write={iteration_usage['cache_creation_input_tokens']})"
+        )
+        
+        if response.stop_reason == "tool_use":
+            # Claude wants to use tools
+            messages.append({"role": "assistant", "content": response.content})
             
-            # Call Claude API with tools
-            response = anthropic_client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=800,  # Increased for tool usage
-                system=SYSTEM_PROMPT,
-                messages=messages,
-                tools=BLOCKSCOUT_TOOLS  # CRITICAL for MCP Prize!
+            # Process tool calls concurrently, keeping Claude's original order
+            tool_blocks = [block for block in response.content if block.type == "tool_use"]
+            turn_semaphore = asyncio.Semaphore(TOOL_CALLS_PER_TURN)
+            outcomes = await asyncio.gather(
+                *(_run_tool_call(block, turn_semaphore) for block in tool_blocks),
+                return_exceptions=True
             )
             
-            logger.info(f"Claude response iteration {iteration}: {response.stop_reason}")
-            
-            if response.stop_reason == "tool_use":
-                # Claude wants to use tools
-                messages.append({"role": "assistant", "content": response.content})
+            tool_results_content = []
+            for block, outcome in zip(tool_blocks, outcomes):
+                if isinstance(outcome, BaseException):
+                    logger.error(f"Tool call {block.name} failed: {outcome}")
+                    tool_results_content.append({
+                        "type": "tool_result",
+                        "tool_use_id": block.id,
+                        "content": json.dumps({"error": f"Tool call failed: {outcome}"}),
+                        "is_error": True
+                    })
+                    continue
                 
-                # Process tool calls
-                tool_results_content = []
-                for block in response.content:
-                    if block.type == "tool_use":
-                        logger.info(f"🔧 Tool call: {block.name}")
-                        logger.info(f"📥 Input: {block.input}")
-                        
-                        # Call Blockscout API
-                        result = await call_blockscout_api(block.name, block.input)
-                        logger.info(f"📤 Result: {str(result)[:200]}...")  # First 200 chars
-                        
-                        # ✅ Check if this is token data from get_tokens_by_address
-                        if isinstance(result, dict) and 'items' in result and result['items']:
-                            # Check if first item has token data
-                            first_item = result['items'][0]
-                            if isinstance(first_item, dict) and 'token' in first_item:
-                                token_info = first_item['token']
-                                if 'symbol' in token_info and 'exchange_rate' in token_info:
-                                    token_data = token_info  # Store token data
-                        
-                        # ✅ CRITICAL: Limit result size to prevent token overflow!
-                        # Blockscout returns HUGE data, we need to truncate it
-                        if isinstance(result, dict):
-                            # Limit items in arrays to first 3
-                            if "items" in result and isinstance(result["items"], list):
-                                result["items"] = result["items"][:3]  # Only first 3 items
-                            result_str = json.dumps(result)[:5000]  # Max 5000 chars
-                        else:
-                            result_str = str(result)[:5000]  # Max 5000 chars
-                        
-                        tool_results_content.append({
-                            "type": "tool_result",
-                            "tool_use_id": block.id,
-                            "content": result_str
-                        })
-                
-                # Add tool results
-                messages.append({"role": "user", "content": tool_results_content})
-                continue  # CRITICAL! Continue loop to get final response
-                
-            elif response.stop_reason == "end_turn":
-                # Extract final answer
-                final_text = ""
-                for block in response.content:
-                    if hasattr(block, "text"):
-                        final_text += block.text
-                
-                return final_text.strip() or "I couldn't generate a response. Please try again.", token_data
+                tool_result, token_info = outcome
+                if token_info:
+                    token_data = token_info  # Store token data
+                tool_results_content.append(tool_result)
             
-            else:
-                logger.warning(f"Unexpected stop_reason: {response.stop_reason}")
-                break
+            # Add tool results
+            messages.append({"role": "user", "content": tool_results_content})
+            continue  # CRITICAL! Continue loop to get final response
+            
+        elif planning and response.stop_reason in ("end_turn", "max_tokens"):
+            # Planner is done with tools (DONE, or cut off): the synthesis model writes the answer
+            synthesize = True
+            continue
+            
+        elif response.stop_reason == "end_turn":
+            # Extract final answer
+            final_text = ""
+            for block in response.content:
+                if hasattr(block, "text"):
+                    final_text += block.text
+            
+            _log_usage_totals(budget, usage_totals, model_stats)
+            return final_text.strip() or EMPTY_RESPONSE_TEXT, token_data
         
-        return "Analysis took too long. Please try a simpler query.", token_data
+        else:
+            logger.warning(f"Unexpected stop_reason: {response.stop_reason}")
+            break
+    
+    _log_usage_totals(budget, usage_totals, model_stats)
+    return ANALYSIS_TIMEOUT_TEXT, token_data
+
+
+USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens")
+
+
+def _usage_counts(usage: Any) -> Dict[str, int]:
+    """Token counts from a response's usage block (cache fields may be missing)"""
+    return {name: getattr(usage, name, 0) or 0 for name in USAGE_FIELDS}
+
+
+def _log_usage_totals(budget: ToolLoopBudget, totals: Dict[str, int], model_stats: ModelStats) -> None:
+    """Log per-request token usage including prompt cache reads/writes, and per-model latency"""
+    logger.info(
+        f"💰 Claude usage ({budget.summary()}): input={totals['input_tokens']}, "
+        f"output={totals['output_tokens']}, cache_read={totals['cache_read_input_tokens']}, "
+        f"cache_write={totals['cache_creation_input_tokens']}"
+    )
+    logger.info(f"🧭 Claude models: {model_stats.summary()}")
+
+
+async def reply_with_analysis(
+    update: Update,
+    query: str,
+    chain: str = "1",
+    handler_name: str = "handler",
+    address: Optional[str] = None,
+    context_loader: Optional[Callable[[], Awaitable[tuple[str, dict]]]] = None,
+    use_tools: bool = True
+) -> None:
+    """Admit the request, stream Claude's analysis and send the formatted reply
+    
+    With an address (/analyze), answers are served from the analysis cache when
+    fresh, and otherwise core data is prefetched while the placeholder is sent.
+    context_loader replaces the default prefetch (e.g. the /sweep fan-out).
+    """
+    with trace_span(f"telegram.{handler_name}", chat_id=update.effective_chat.id, chain=chain) as root:
+        cache_key = analysis_cache_key(address, chain) if address and ANALYSIS_CACHE_TTL > 0 else None
+        if cache_key:
+            hit, cached = analysis_cache.get(cache_key)
+            root.set(analysis_cache_hit=hit)
+            if hit:
+                logger.info(f"⚡ Analysis cache hit for {address} on chain {chain}")
+                with trace_span("telegram.send"):
+                    await reply_in_chunks(update.message, build_telegram_reply(cached["analysis"], cached["token_data"]))
+                return
         
-    except Exception as e:
-        logger.error(f"Error processing with Claude: {str(e)}", exc_info=True)
-        return f"Sorry, I encountered an error analyzing your request. Please try again.", {}
+        queued_at = time.monotonic()
+        try:
+            async with claude_scheduler.admit(update.effective_chat.id):
+                root.set(queue_wait_ms=round((time.monotonic() - queued_at) * 1000, 3))
+                streamer = TelegramStreamer(update.message, format_for_telegram)
+                prefetch = None
+                if context_loader is not None:
+                    prefetch = asyncio.create_task(context_loader())
+                elif address and ANALYZE_PREFETCH:
+                    prefetch = asyncio.create_task(prefetch_address_data(address, chain))
+                try:
+                    with trace_span("telegram.placeholder"):
+                        await streamer.start()
+                    context_data, prefetched_token_data = await prefetch if prefetch else ("", {})
+                    claude_analysis, token_data = await process_with_claude(
+                        query, chain=chain, stream=streamer, context=context_data,
+                        query_class="analysis" if address else None, use_tools=use_tools
+                    )
+                    token_data = token_data or prefetched_token_data
+                    with trace_span("telegram.format"):
+                        reply_text = build_telegram_reply(claude_analysis, token_data)
+                    with trace_span("telegram.send", chars=len(reply_text)):
+                        await streamer.finish(reply_text)
+                    
+                    if cache_key and claude_analysis not in ANALYSIS_FAILURE_TEXTS:
+                        analysis_cache.set(
+                            cache_key, {"analysis": claude_analysis, "token_data": token_data}, ANALYSIS_CACHE_TTL
+                        )
+                    
+                except Exception as e:
+                    logger.error(f"Error in {handler_name}: {e}")
+                    root.set(failed=True)
+                    await streamer.finish("❌ Sorry, something went wrong. Please try again later.")
+                finally:
+                    if prefetch:
+                        prefetch.cancel()
+        
+        except SchedulerBusy as e:
+            logger.info(f"⏳ {handler_name} rejected for chat {update.effective_chat.id}: {e.reason}")
+            root.set(rejected=e.reason)
+            await update.message.reply_text(BUSY_MESSAGES[e.reason], parse_mode=None)
 
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -903,49 +1559,25 @@ async def analyze_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     address = args[0]
     network = args[1].lower() if len(args) > 1 else "ethereum"
     
-    # Map network names to chain IDs
-    chain_map = {
-        "ethereum": "1",
-        "eth": "1",
-        "base": "8453",
-        "polygon": "137",
-        "matic": "137",
-        "arbitrum": "42161",
-        "arbitrum one": "42161",
-        "optimism": "10",
-        "bsc": "56",
-        "binance": "56",
-        "avalanche": "43114",
-        "avax": "43114",
-        "fantom": "250",
-        "gnosis": "100",
-        "linea": "59144"
-    }
-    
-    if network not in chain_map:
-        # Check if it's a numeric chain ID
-        if network.isdigit():
-            chain_id = network
-        else:
-            await update.message.reply_text(
-                f"❌ Unsupported network: {network}\n\n"
-                "Supported networks:\n"
-                "• ethereum (or eth)\n"
-                "• base\n"
-                "• polygon (or matic)\n"
-                "• arbitrum\n"
-                "• optimism\n"
-                "• bsc (or binance)\n"
-                "• avalanche (or avax)\n"
-                "• fantom\n"
-                "• gnosis\n"
-                "• linea\n\n"
-                "Or use chain ID directly (e.g., 42161 for Arbitrum)",
-                parse_mode=None
-            )
-            return
-    else:
-        chain_id = chain_map[network]
+    chain_id = chain_id_for_network(network)
+    if chain_id is None:
+        await update.message.reply_text(
+            f"❌ Unsupported network: {network}\n\n"
+            "Supported networks:\n"
+            "• ethereum (or eth)\n"
+            "• base\n"
+            "• polygon (or matic)\n"
+            "• arbitrum\n"
+            "• optimism\n"
+            "• bsc (or binance)\n"
+            "• avalanche (or avax)\n"
+            "• fantom\n"
+            "• gnosis\n"
+            "• linea\n\n"
+            "Or use chain ID directly (e.g., 42161 for Arbitrum)",
+            parse_mode=None
+        )
+        return
     
     # Show typing indicator
     await update.message.chat.send_action("typing")
@@ -953,75 +1585,7 @@ async def analyze_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     # Process with Claude
     query = f"Analyze this address on {network.title()} network: {address}. Provide a comprehensive overview including balance, tokens, recent activity, and any notable patterns or risks."
     
-    try:
-        claude_analysis, token_data = await process_with_claude(query, chain=chain_id)
-        
-        # ========== TOKEN CHECK ==========
-        
-        # Check if this is a token
-        if token_data and 'symbol' in token_data and 'exchange_rate' in token_data:
-            # THIS IS A TOKEN! Add statistics BEFORE Claude analysis
-            stats_block = format_token_stats(token_data)
-            
-            # ========== TELEGRAM FORMATTING ==========
-            
-            # Remove markdown from analysis
-            analysis_text = claude_analysis.replace('**', '')
-            analysis_text = analysis_text.replace('••', '')
-            
-            # Add line breaks before sections
-            analysis_text = analysis_text.replace('Address:', '\n\n📍 Address:')
-            analysis_text = analysis_text.replace('Token:', '\n\n🪙 Token:')
-            analysis_text = analysis_text.replace('Holders:', '\n\n👥 Holders:')
-            analysis_text = analysis_text.replace('24h Volume:', '\n\n📊 Volume:')
-            analysis_text = analysis_text.replace('Recent Activity:', '\n\n🔍 Activity:')
-            analysis_text = analysis_text.replace('Risk:', '\n\n⚠️ Risk:')
-            analysis_text = analysis_text.replace('Key Insights:', '\n\n💡 Insights:')
-            
-            # Each bullet on new line
-            analysis_text = analysis_text.replace('•', '\n•')
-            
-            # Remove extra line breaks
-            while '\n\n\n' in analysis_text:
-                analysis_text = analysis_text.replace('\n\n\n', '\n\n')
-            
-            # Combine: STATS + ANALYSIS
-            final_message = stats_block + analysis_text
-            
-            # Send to user
-            await update.message.reply_text(final_message.strip(), parse_mode=None)
-        else:
-            # Regular wallet/contract - only Claude analysis
-            # ========== TELEGRAM FORMATTING ==========
-            
-            # Remove markdown
-            result_text = claude_analysis.replace('**', '')
-            result_text = result_text.replace('••', '')
-            
-            # Add line breaks before sections
-            result_text = result_text.replace('Address:', '\n\n📍 Address:')
-            result_text = result_text.replace('Token:', '\n\n🪙 Token:')
-            result_text = result_text.replace('Holders:', '\n\n👥 Holders:')
-            result_text = result_text.replace('24h Volume:', '\n\n📊 Volume:')
-            result_text = result_text.replace('Recent Activity:', '\n\n🔍 Activity:')
-            result_text = result_text.replace('Risk:', '\n\n⚠️ Risk:')
-            result_text = result_text.replace('Key Insights:', '\n\n💡 Insights:')
-            
-            # Each bullet on new line
-            result_text = result_text.replace('•', '\n•')
-            
-            # Remove extra line breaks
-            while '\n\n\n' in result_text:
-                result_text = result_text.replace('\n\n\n', '\n\n')
-            
-            await update.message.reply_text(result_text.strip(), parse_mode=None)
-        
-    except Exception as e:
-        logger.error(f"Error in analyze_command: {e}")
-        await update.message.reply_text(
-            "❌ Sorry, something went wrong. Please try again later.",
-            parse_mode=None
-        )
+    await reply_with_analysis(update, query, chain=chain_id, handler_name="analyze_command", address=address)
 
 
 async def analyze_base_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -1044,75 +1608,149 @@ async def analyze_base_command(update: Update, context: ContextTypes.DEFAULT_TYP
     # Process with Claude on Base network
     query = f"Analyze this address on Base network: {address}. Provide a comprehensive overview including balance, tokens, recent activity, and any notable patterns or risks."
     
-    try:
-        claude_analysis, token_data = await process_with_claude(query, chain="8453")
-        
-        # ========== TOKEN CHECK ==========
-        
-        # Check if this is a token
-        if token_data and 'symbol' in token_data and 'exchange_rate' in token_data:
-            # THIS IS A TOKEN! Add statistics BEFORE Claude analysis
-            stats_block = format_token_stats(token_data)
-            
-            # ========== TELEGRAM FORMATTING ==========
-            
-            # Remove markdown from analysis
-            analysis_text = claude_analysis.replace('**', '')
-            analysis_text = analysis_text.replace('••', '')
-            
-            # Add line breaks before sections
-            analysis_text = analysis_text.replace('Address:', '\n\n📍 Address:')
-            analysis_text = analysis_text.replace('Token:', '\n\n🪙 Token:')
-            analysis_text = analysis_text.replace('Holders:', '\n\n👥 Holders:')
-            analysis_text = analysis_text.replace('24h Volume:', '\n\n📊 Volume:')
-            analysis_text = analysis_text.replace('Recent Activity:', '\n\n🔍 Activity:')
-            analysis_text = analysis_text.replace('Risk:', '\n\n⚠️ Risk:')
-            analysis_text = analysis_text.replace('Key Insights:', '\n\n💡 Insights:')
-            
-            # Each bullet on new line
-            analysis_text = analysis_text.replace('•', '\n•')
-            
-            # Remove extra line breaks
-            while '\n\n\n' in analysis_text:
-                analysis_text = analysis_text.replace('\n\n\n', '\n\n')
-            
-            # Combine: STATS + ANALYSIS
-            final_message = stats_block + analysis_text
-            
-            # Send to user
-            await update.message.reply_text(final_message.strip(), parse_mode=None)
-        else:
-            # Regular wallet/contract - only Claude analysis
-            # ========== TELEGRAM FORMATTING ==========
-            
-            # Remove markdown
-            result_text = claude_analysis.replace('**', '')
-            result_text = result_text.replace('••', '')
-            
-            # Add line breaks before sections
-            result_text = result_text.replace('Address:', '\n\n📍 Address:')
-            result_text = result_text.replace('Token:', '\n\n🪙 Token:')
-            result_text = result_text.replace('Holders:', '\n\n👥 Holders:')
-            result_text = result_text.replace('24h Volume:', '\n\n📊 Volume:')
-            result_text = result_text.replace('Recent Activity:', '\n\n🔍 Activity:')
-            result_text = result_text.replace('Risk:', '\n\n⚠️ Risk:')
-            result_text = result_text.replace('Key Insights:', '\n\n💡 Insights:')
-            
-            # Each bullet on new line
-            result_text = result_text.replace('•', '\n•')
-            
-            # Remove extra line breaks
-            while '\n\n\n' in result_text:
-                result_text = result_text.replace('\n\n\n', '\n\n')
-            
-            await update.message.reply_text(result_text.strip(), parse_mode=None)
-        
-    except Exception as e:
-        logger.error(f"Error in analyze_base_command: {e}")
+    await reply_with_analysis(update, query, chain="8453", handler_name="analyze_base_command", address=address)
+
+
+async def sweep_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /sweep command - one address across all sweep chains at once"""
+    if not context.args:
         await update.message.reply_text(
-            "❌ Sorry, something went wrong. Please try again later.",
+            "❌ Please provide an address to sweep.\n\n"
+            "Usage: /sweep <address>\n"
+            "Example: /sweep vitalik.eth\n\n"
+            f"Checks {len(SWEEP_CHAINS)} networks at once and summarizes holdings everywhere",
             parse_mode=None
         )
+        return
+    
+    address = context.args[0]
+    if not address.lower().startswith("0x"):
+        resolved_address = await ens_resolver.resolve(address)
+        if resolved_address is None:
+            await update.message.reply_text(f"❌ {address} does not resolve to an address", parse_mode=None)
+            return
+        address = resolved_address
+    
+    # Show typing indicator
+    await update.message.chat.send_action("typing")
+    
+    # One synthesis call over the merged portfolio, no tool loop
+    query = f"Summarize the holdings of {address} across all networks: where the value is, notable tokens, and how the portfolio is spread across chains."
+    
+    await reply_with_analysis(
+        update, query, chain="all", handler_name="sweep_command", address=address,
+        context_loader=lambda: sweep_address(address), use_tools=False
+    )
+
+
+async def _resolve_watch_address(update: Update, address: str) -> Optional[str]:
+    """Address or ENS name -> lowercase address (replies and returns None on failure)"""
+    if not address.lower().startswith("0x"):
+        resolved_address = await ens_resolver.resolve(address)
+        if resolved_address is None:
+            await update.message.reply_text(f"❌ {address} does not resolve to an address", parse_mode=None)
+            return None
+        address = resolved_address
+    if not re.fullmatch(r"0x[a-fA-F0-9]{40}", address):
+        await update.message.reply_text(f"❌ Invalid address: {address}", parse_mode=None)
+        return None
+    return address.lower()
+
+
+def _address_label(address: str) -> str:
+    """Address with its primary ENS name when one is known"""
+    name = ens_resolver.primary_name(address)
+    return f"{name} ({address})" if name else address
+
+
+def _chain_name(chain_id: str) -> str:
+    return (chain_registry.get(chain_id) or {}).get("name") or f"chain {chain_id}"
+
+
+async def watch_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /watch command - push alerts on new activity for an address"""
+    if not context.args:
+        await update.message.reply_text(
+            "❌ Please provide an address to watch.\n\n"
+            "Usage: /watch <address> [network]\n"
+            "Example: /watch vitalik.eth\n"
+            "Example: /watch 0x123... base",
+            parse_mode=None
+        )
+        return
+    
+    network = context.args[1] if len(context.args) > 1 else "ethereum"
+    chain_id = chain_id_for_network(network)
+    if chain_id is None:
+        await update.message.reply_text(f"❌ Unsupported network: {network}", parse_mode=None)
+        return
+    
+    address = await _resolve_watch_address(update, context.args[0])
+    if address is None:
+        return
+    
+    if not watchlist.add(update.effective_chat.id, address, chain_id):
+        await update.message.reply_text(
+            f"❌ This chat already watches {WATCH_MAX_PER_CHAT} addresses. Use /unwatch to free a slot.",
+            parse_mode=None
+        )
+        return
+    
+    await update.message.reply_text(
+        f"👀 Watching {_address_label(address)} on {_chain_name(chain_id)}.\n"
+        "You'll get a short alert when it has new transactions. Stop with /unwatch.",
+        parse_mode=None
+    )
+
+
+async def unwatch_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /unwatch command - stop alerts for one address or all of them"""
+    if not context.args:
+        await update.message.reply_text(
+            "❌ Please provide an address to stop watching.\n\n"
+            "Usage: /unwatch <address|all> [network]\n"
+            "Example: /unwatch 0x123...\n"
+            "Example: /unwatch all",
+            parse_mode=None
+        )
+        return
+    
+    chat_id = update.effective_chat.id
+    if context.args[0].lower() == "all":
+        removed = watchlist.remove(chat_id)
+        await update.message.reply_text(f"🔕 Stopped watching {removed} address(es)", parse_mode=None)
+        return
+    
+    chain_id = None
+    if len(context.args) > 1:
+        chain_id = chain_id_for_network(context.args[1])
+        if chain_id is None:
+            await update.message.reply_text(f"❌ Unsupported network: {context.args[1]}", parse_mode=None)
+            return
+    
+    address = await _resolve_watch_address(update, context.args[0])
+    if address is None:
+        return
+    
+    if watchlist.remove(chat_id, address, chain_id):
+        await update.message.reply_text(f"🔕 Stopped watching {address}", parse_mode=None)
+    else:
+        await update.message.reply_text(f"ℹ️ {address} is not on this chat's watchlist", parse_mode=None)
+
+
+async def watchlist_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /watchlist command - list this chat's watched addresses"""
+    watches = watchlist.for_chat(update.effective_chat.id)
+    if not watches:
+        await update.message.reply_text(
+            "📭 No watched addresses. Add one with /watch <address> [network]",
+            parse_mode=None
+        )
+        return
+    
+    lines = [f"👀 Watching {len(watches)}/{WATCH_MAX_PER_CHAT} address(es):"]
+    lines += [f"• {_address_label(address)} on {_chain_name(chain_id)}" for address, chain_id in watches]
+    await update.message.reply_text("\n".join(lines), parse_mode=None)
 
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -1127,6 +1765,14 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
   Example: `/analyze 0x123... polygon`
 • `/analyze_base <address>` - Quick Base network analysis
   Example: `/analyze_base 0x123...`
+• `/sweep <address>` - Holdings across all major networks at once
+  Example: `/sweep vitalik.eth`
+
+*👀 Watchlist Commands:*
+• `/watch <address> [network]` - Alert this chat on new transactions
+  Example: `/watch vitalik.eth base`
+• `/unwatch <address|all> [network]` - Stop alerts
+• `/watchlist` - Addresses this chat is watching
 
 *📊 Network Commands:*
 • `/chains` - List of supported blockchain networks
@@ -1192,7 +1838,8 @@ async def chains_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     for chain in popular_chains:
         response += f"• *{chain['name']}* (ID: {chain['id']}) - {chain['description']}\n"
     
-    response += "\n📊 *Total Supported: 1000+ chains*\n\n"
+    total_chains = len(chain_registry.chains())
+    response += f"\n📊 *Total Supported: {total_chains} mainnets*\n\n"
     response += "*💡 How to use:*\n"
     response += "• `/analyze <address> <network>` - Use network name\n"
     response += "• `/analyze <address> <chain_id>` - Use chain ID\n\n"
@@ -1214,74 +1861,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     await update.message.chat.send_action("typing")
     
     # Process with Claude
-    try:
-        claude_analysis, token_data = await process_with_claude(user_message)
-        
-        
-        # Check if this is a token
-        if token_data and 'symbol' in token_data and 'exchange_rate' in token_data:
-            # THIS IS A TOKEN! Add statistics BEFORE Claude analysis
-            stats_block = format_token_stats(token_data)
-            
-            # ========== TELEGRAM FORMATTING ==========
-            
-            # Remove markdown from analysis
-            analysis_text = claude_analysis.replace('**', '')
-            analysis_text = analysis_text.replace('••', '')
-            
-            # Add line breaks before sections
-            analysis_text = analysis_text.replace('Address:', '\n\n📍 Address:')
-            analysis_text = analysis_text.replace('Token:', '\n\n🪙 Token:')
-            analysis_text = analysis_text.replace('Holders:', '\n\n👥 Holders:')
-            analysis_text = analysis_text.replace('24h Volume:', '\n\n📊 Volume:')
-            analysis_text = analysis_text.replace('Recent Activity:', '\n\n🔍 Activity:')
-            analysis_text = analysis_text.replace('Risk:', '\n\n⚠️ Risk:')
-            analysis_text = analysis_text.replace('Key Insights:', '\n\n💡 Insights:')
-            
-            # Each bullet on new line
-            analysis_text = analysis_text.replace('•', '\n•')
-            
-            # Remove extra line breaks
-            while '\n\n\n' in analysis_text:
-                analysis_text = analysis_text.replace('\n\n\n', '\n\n')
-            
-            # Combine: STATS + ANALYSIS
-            final_message = stats_block + analysis_text
-            
-            # Send to user
-            await update.message.reply_text(final_message.strip(), parse_mode=None)
-        else:
-            # Regular wallet/contract - only Claude analysis
-            # ========== TELEGRAM FORMATTING ==========
-            
-            # Remove markdown
-            result_text = claude_analysis.replace('**', '')
-            result_text = result_text.replace('••', '')
-            
-            # Add line breaks before sections
-            result_text = result_text.replace('Address:', '\n\n📍 Address:')
-            result_text = result_text.replace('Token:', '\n\n🪙 Token:')
-            result_text = result_text.replace('Holders:', '\n\n👥 Holders:')
-            result_text = result_text.replace('24h Volume:', '\n\n📊 Volume:')
-            result_text = result_text.replace('Recent Activity:', '\n\n🔍 Activity:')
-            result_text = result_text.replace('Risk:', '\n\n⚠️ Risk:')
-            result_text = result_text.replace('Key Insights:', '\n\n💡 Insights:')
-            
-            # Each bullet on new line
-            result_text = result_text.replace('•', '\n•')
-            
-            # Remove extra line breaks
-            while '\n\n\n' in result_text:
-                result_text = result_text.replace('\n\n\n', '\n\n')
-            
-            await update.message.reply_text(result_text.strip(), parse_mode=None)
-        
-    except Exception as e:
-        logger.error(f"Error in handle_message: {e}")
-        await update.message.reply_text(
-            "❌ Sorry, something went wrong. Please try again later.",
-            parse_mode=None
-        )
+    await reply_with_analysis(update, user_message, handler_name="handle_message")
 
 
 async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -1294,6 +1874,70 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         )
 
 
+async def post_init(application: Application) -> None:
+    """Start background jobs once the bot is initialized"""
+    global watch_poller
+    chain_registry.start()
+    
+    async def notify(chat_id: int, text: str) -> None:
+        try:
+            await application.bot.send_message(chat_id, text, parse_mode=None)
+        except Forbidden:
+            # Bot was blocked or removed from the chat
+            logger.info(f"🔕 Dropping watches for chat {chat_id}: bot can no longer post there")
+            watchlist.remove(chat_id)
+        except TelegramError as e:
+            logger.warning(f"Watch alert to chat {chat_id} failed: {e}")
+    
+    watch_poller = WatchPoller(watchlist, chain_registry.api_url, notify, chain_name=_chain_name)
+    watch_poller.start()
+
+
+async def post_shutdown(application: Application) -> None:
+    """Stop background jobs and release pooled connections when the bot stops"""
+    await chain_registry.stop()
+    if watch_poller is not None:
+        await watch_poller.stop()
+    watchlist.close()
+    await blockscout_client.aclose()
+    ens_resolver.close()
+    if isinstance(analysis_cache, PersistentTTLCache):
+        analysis_cache.close()
+    close_exporters()
+
+
+def build_application(builder: Optional[ApplicationBuilder] = None) -> Application:
+    """Create the application with every handler registered
+    
+    A preconfigured builder (e.g. with a custom request transport for
+    benchmarks) can be passed in; token and lifecycle hooks are added here.
+    """
+    application = (
+        (builder or Application.builder())
+        .token(TELEGRAM_TOKEN)
+        .concurrent_updates(TELEGRAM_CONCURRENT_UPDATES)
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
+    
+    # Add handlers
+    application.add_handler(CommandHandler("start", counted(start_command)))
+    application.add_handler(CommandHandler("help", counted(help_command)))
+    application.add_handler(CommandHandler("analyze", counted(analyze_command)))
+    application.add_handler(CommandHandler("analyze_base", counted(analyze_base_command)))
+    application.add_handler(CommandHandler("sweep", counted(sweep_command)))
+    application.add_handler(CommandHandler("chains", counted(chains_command)))
+    application.add_handler(CommandHandler("watch", counted(watch_command)))
+    application.add_handler(CommandHandler("unwatch", counted(unwatch_command)))
+    application.add_handler(CommandHandler("watchlist", counted(watchlist_command)))
+    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, counted(handle_message)))
+    
+    # Add error handler
+    application.add_error_handler(error_handler)
+    return application
+
+
 def main() -> None:
     """Start the bot"""
     if not TELEGRAM_TOKEN:
@@ -1304,23 +1948,22 @@ def main() -> None:
         logger.error("CLAUDE_API_KEY not found in environment variables")
         return
     
-    # Create application
-    application = Application.builder().token(TELEGRAM_TOKEN).build()
+    # Metrics endpoint (METRICS_PORT); trace spans feed the stage histograms
+    if start_metrics_server():
+        trace_exporters.append(MetricsExporter())
+        register_stats("blockscout_cache", blockscout_cache.stats)
+        register_stats("blockscout_singleflight", blockscout_flights.stats)
+        register_stats("analysis_cache", analysis_cache.stats)
+        register_stats("scheduler", claude_scheduler.stats)
     
-    # Add handlers
-    application.add_handler(CommandHandler("start", start_command))
-    application.add_handler(CommandHandler("help", help_command))
-    application.add_handler(CommandHandler("analyze", analyze_command))
-    application.add_handler(CommandHandler("analyze_base", analyze_base_command))
-    application.add_handler(CommandHandler("chains", chains_command))
-    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
-    
-    # Add error handler
-    application.add_error_handler(error_handler)
+    application = build_application()
     
     # Start bot
-    logger.info("🚀 BlockScout AI Bot starting...")
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    logger.info(f"🚀 BlockScout AI Bot starting ({BOT_MODE} mode)...")
+    if BOT_MODE == "webhook":
+        asyncio.run(run_webhook(application))
+    else:
+        application.run_polling(allowed_updates=Update.ALL_TYPES)
 
 
 if __name__ == "__main__":
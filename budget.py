@@ -0,0 +1,97 @@
+"""
+BlockScout AI - Tool loop budgets
+Per-query-class token, iteration and latency ceilings for the Claude tool loop
+"""
+
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    """Limits for one class of query"""
+    max_tokens: int        # max_tokens per model call
+    max_iterations: int    # model round trips
+    token_budget: int      # cumulative input + output tokens
+    time_budget: float     # seconds of wall time
+
+
+QUERY_BUDGETS: Dict[str, QueryBudget] = {
+    # Single fact: balance, price, latest block, one transaction
+    "lookup": QueryBudget(max_tokens=400, max_iterations=3, token_budget=25_000, time_budget=20.0),
+    # Free-form questions
+    "question": QueryBudget(max_tokens=600, max_iterations=4, token_budget=45_000, time_budget=35.0),
+    # /analyze and other full overviews
+    "analysis": QueryBudget(max_tokens=800, max_iterations=5, token_budget=70_000, time_budget=45.0),
+}
+
+# Fraction of the token/time budget after which the next call must answer
+FINALIZE_AT = 0.75
+
+LOOKUP_PATTERN = re.compile(
+    r"\b(balance|price|latest block|block number|gas|holders?|decimals|supply|status)\b", re.IGNORECASE
+)
+ANALYSIS_PATTERN = re.compile(r"\b(analy[sz]e|overview|portfolio|risk|safe|audit)\b", re.IGNORECASE)
+
+FINAL_ANSWER_NUDGE = (
+    "Budget reached: do not call more tools. Answer now with the data you already have."
+)
+
+
+def classify_query(user_message: str) -> str:
+    """Rough query class used to pick a budget"""
+    if ANALYSIS_PATTERN.search(user_message):
+        return "analysis"
+    if len(user_message) < 120 and LOOKUP_PATTERN.search(user_message):
+        return "lookup"
+    return "question"
+
+
+class ToolLoopBudget:
+    """Tracks tokens, iterations and wall time across one tool loop"""
+
+    def __init__(self, budget: QueryBudget, query_class: str = "question"):
+        self.budget = budget
+        self.query_class = query_class
+        self.started_at = time.monotonic()
+        self.iterations = 0
+        self.tokens = 0
+
+    @classmethod
+    def for_query(cls, user_message: str, query_class: Optional[str] = None) -> "ToolLoopBudget":
+        query_class = query_class or classify_query(user_message)
+        return cls(QUERY_BUDGETS[query_class], query_class)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def max_tokens(self) -> int:
+        return self.budget.max_tokens
+
+    def record(self, usage: Dict[str, int]) -> None:
+        """Account for one model call's usage counts"""
+        self.iterations += 1
+        self.tokens += sum(usage.values())
+
+    def exhausted(self) -> bool:
+        """No model calls left"""
+        return self.iterations >= self.budget.max_iterations
+
+    def must_finalize(self) -> bool:
+        """The next call is the last one the budget allows: force a final answer"""
+        return (
+            self.iterations + 1 >= self.budget.max_iterations
+            or self.tokens >= FINALIZE_AT * self.budget.token_budget
+            or self.elapsed >= FINALIZE_AT * self.budget.time_budget
+        )
+
+    def summary(self) -> str:
+        return (
+            f"{self.iterations}/{self.budget.max_iterations} iterations, "
+            f"{self.tokens}/{self.budget.token_budget} tokens, "
+            f"{self.elapsed:.1f}/{self.budget.time_budget:.0f}s"
+        )
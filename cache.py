@@ -0,0 +1,220 @@
+"""
+BlockScout AI - Response caching
+TTL + LRU cache bounded by payload bytes and single-flight request coalescing,
+used in front of Blockscout calls
+"""
+
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Awaitable, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize tool params so equivalent requests share a cache key"""
+    normalized = {}
+    for name, value in params.items():
+        if name == "chain_id" or value is None or value == "":
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+            # Addresses, hashes and ENS names are case-insensitive
+            if value.startswith("0x") or value.endswith(".eth"):
+                value = value.lower()
+        normalized[name] = value
+    return normalized
+
+
+def make_cache_key(tool_name: str, chain_id: str, params: Dict[str, Any]) -> str:
+    """Build a stable key from (tool_name, chain_id, normalized params)"""
+    return json.dumps(
+        [tool_name, chain_id, normalize_params(params)],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+
+
+class TTLCache:
+    """LRU cache with per-entry TTL, bounded by total serialized bytes
+
+    Values are stored as JSON so every hit returns a fresh copy callers can
+    mutate freely.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (hit, value); expired entries count as misses"""
+        payload = self._load(key)
+        if payload is None:
+            self.misses += 1
+            return False, None
+
+        self.hits += 1
+        return True, json.loads(payload)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value for ttl seconds, evicting least recently used entries"""
+        payload = json.dumps(value, separators=(",", ":"), default=str).encode()
+        self._store(key, payload, ttl)
+
+    def _load(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, payload = entry
+        if expires_at <= time.monotonic():
+            self._drop(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return payload
+
+    def _store(self, key: str, payload: bytes, ttl: float) -> None:
+        if len(payload) > self.max_bytes:
+            logger.debug(f"Not caching {len(payload)} byte payload (limit {self.max_bytes})")
+            return
+
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (time.monotonic() + ttl, payload)
+        self._bytes += len(payload)
+
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+
+class PersistentTTLCache(TTLCache):
+    """TTLCache whose entries are also written to SQLite and survive restarts
+
+    Memory stays the hot tier; entries found only on disk are promoted back
+    into it on first access.
+    """
+
+    # Expired rows are purged from disk every this many writes
+    PURGE_EVERY = 100
+
+    def __init__(self, path: str, max_bytes: int = 32 * 1024 * 1024):
+        super().__init__(max_bytes)
+        self.path = path
+        self._writes = 0
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries "
+                "(key TEXT PRIMARY KEY, payload BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            with self._db:
+                self._db.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+        return self._db
+
+    def _load(self, key: str) -> Optional[bytes]:
+        payload = super()._load(key)
+        if payload is not None:
+            return payload
+
+        row = self.db.execute(
+            "SELECT payload, expires_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        remaining = row[1] - time.time()
+        if remaining <= 0:
+            with self.db:
+                self.db.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            return None
+
+        TTLCache._store(self, key, row[0], remaining)
+        return row[0]
+
+    def _store(self, key: str, payload: bytes, ttl: float) -> None:
+        super()._store(key, payload, ttl)
+        self._writes += 1
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, payload, expires_at) VALUES (?, ?, ?)",
+                (key, payload, time.time() + ttl),
+            )
+            if self._writes % self.PURGE_EVERY == 0:
+                self.db.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key onto one in-flight task
+
+    Followers await the leader's task instead of starting their own request.
+    The task is shielded, so a cancelled caller never cancels the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run factory() once per key at a time and share its result"""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            logger.debug(f"Coalesced request for {key}")
+            return await asyncio.shield(task)
+
+        self.calls += 1
+        task = asyncio.ensure_future(factory())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        """Executed vs coalesced request counters"""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
@@ -0,0 +1,166 @@
+"""
+BlockScout AI - Chain registry
+Chain ID -> Blockscout instance index loaded from Blockscout's chain list,
+persisted on disk and refreshed in the background
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional
+
+from blockscout_client import blockscout_client
+
+logger = logging.getLogger(__name__)
+
+CHAINS_SOURCE_URL = os.getenv("CHAINS_SOURCE_URL", "https://chains.blockscout.com/api/chains")
+DATA_DIR = os.getenv("BOT_DATA_DIR", "data")
+CHAIN_REGISTRY_PATH = os.getenv("CHAIN_REGISTRY_PATH", os.path.join(DATA_DIR, "chains.json"))
+CHAIN_REGISTRY_REFRESH = float(os.getenv("CHAIN_REGISTRY_REFRESH", str(6 * 3600)))
+# Minimum gap between on-demand refreshes triggered by unknown chain IDs
+ON_DEMAND_REFRESH_INTERVAL = 60.0
+
+
+def _api_url(explorer_url: str) -> str:
+    """https://eth.blockscout.com/ -> https://eth.blockscout.com/api/v2"""
+    return explorer_url.rstrip("/") + "/api/v2"
+
+
+def parse_chains(payload: Any) -> Dict[str, Dict[str, Any]]:
+    """Normalize the chain list payload to {chain_id: {name, url, is_testnet}}"""
+    if isinstance(payload, list):
+        entries = {str(item.get("chainid") or item.get("id")): item for item in payload if isinstance(item, dict)}
+    elif isinstance(payload, dict):
+        entries = payload
+    else:
+        return {}
+
+    chains = {}
+    for chain_id, entry in entries.items():
+        if not isinstance(entry, dict):
+            continue
+        explorers = [e for e in entry.get("explorers") or [] if isinstance(e, dict) and e.get("url")]
+        if not explorers:
+            continue
+        # Prefer instances hosted by Blockscout itself
+        explorers.sort(key=lambda e: e.get("hostedBy") != "blockscout")
+        chains[str(chain_id)] = {
+            "name": entry.get("name") or str(chain_id),
+            "url": _api_url(explorers[0]["url"]),
+            "is_testnet": bool(entry.get("isTestnet")),
+        }
+    return chains
+
+
+class ChainRegistry:
+    """In-memory chain index with on-disk persistence and background refresh"""
+
+    def __init__(
+        self,
+        seed: Dict[str, Dict[str, Any]],
+        source_url: str = CHAINS_SOURCE_URL,
+        path: str = CHAIN_REGISTRY_PATH,
+        refresh_interval: float = CHAIN_REGISTRY_REFRESH,
+    ):
+        self.source_url = source_url
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self._chains: Dict[str, Dict[str, Any]] = {}
+        self._names: Dict[str, str] = {}
+        self._refreshed = False
+        self._last_attempt = float("-inf")
+        self._refresh_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._index({chain_id: {"is_testnet": False, **info} for chain_id, info in seed.items()})
+        self._load_from_disk()
+
+    def __len__(self) -> int:
+        return len(self._chains)
+
+    def _index(self, chains: Dict[str, Dict[str, Any]]) -> None:
+        """Merge chains into the id and name indexes"""
+        self._chains.update(chains)
+        for chain_id, info in chains.items():
+            self._names.setdefault(info["name"].lower(), chain_id)
+
+    def _load_from_disk(self) -> None:
+        try:
+            with open(self.path) as f:
+                self._index(json.load(f))
+            logger.info(f"Loaded {len(self._chains)} chains from {self.path}")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable chain registry {self.path}: {e}")
+
+    def _save_to_disk(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._chains, f)
+        os.replace(tmp_path, self.path)
+
+    async def refresh(self) -> None:
+        """Download the chain list and persist it"""
+        async with self._refresh_lock:
+            self._last_attempt = time.monotonic()
+            chains = parse_chains(await blockscout_client.get_json(self.source_url))
+            if not chains:
+                logger.warning("Chain list was empty - keeping the current registry")
+                return
+            self._index(chains)
+            self._refreshed = True
+            await asyncio.to_thread(self._save_to_disk)
+            logger.info(f"🌐 Chain registry refreshed: {len(self._chains)} chains")
+
+    async def _refresh_forever(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Chain registry refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> None:
+        """Start the background refresh task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def get(self, chain_id: str) -> Optional[Dict[str, Any]]:
+        return self._chains.get(str(chain_id))
+
+    def resolve(self, name_or_id: str) -> Optional[str]:
+        """Chain ID for a chain ID or (case-insensitive) chain name"""
+        value = str(name_or_id).strip()
+        if value in self._chains:
+            return value
+        return self._names.get(value.lower())
+
+    async def api_url(self, chain_id: str) -> Optional[str]:
+        """Blockscout API base URL for a chain, refreshing once if it is unknown"""
+        chain = self._chains.get(chain_id)
+        if (
+            chain is None
+            and not self._refreshed
+            and time.monotonic() - self._last_attempt > ON_DEMAND_REFRESH_INTERVAL
+        ):
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Chain registry refresh failed: {e}")
+            chain = self._chains.get(chain_id)
+        return chain["url"] if chain else None
+
+    def chains(self, include_testnets: bool = False) -> List[Dict[str, Any]]:
+        return [
+            {"chain_id": chain_id, "name": info["name"], "is_testnet": info["is_testnet"]}
+            for chain_id, info in self._chains.items()
+            if include_testnets or not info["is_testnet"]
+        ]
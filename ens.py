@@ -0,0 +1,139 @@
+"""
+BlockScout AI - ENS resolution
+Resolves ENS names through Blockscout's name service (BENS) with a persistent
+name -> address cache (negative results included) and an address -> primary
+name index
+"""
+
+import os
+import time
+import sqlite3
+import logging
+from typing import Optional, Tuple
+
+import httpx
+
+from blockscout_client import blockscout_client
+
+logger = logging.getLogger(__name__)
+
+BENS_URL = os.getenv("BENS_URL", "https://bens.services.blockscout.com/api/v1")
+DATA_DIR = os.getenv("BOT_DATA_DIR", "data")
+ENS_CACHE_PATH = os.getenv("ENS_CACHE_PATH", os.path.join(DATA_DIR, "ens.sqlite3"))
+ENS_TTL = float(os.getenv("ENS_TTL", str(24 * 3600)))
+ENS_NEGATIVE_TTL = float(os.getenv("ENS_NEGATIVE_TTL", "3600"))
+
+
+def normalize_ens_name(name: str) -> str:
+    """Lowercase, trim and default to the .eth TLD ("Vitalik" -> "vitalik.eth")"""
+    name = name.strip().lower()
+    return name if "." in name else f"{name}.eth"
+
+
+class ENSResolver:
+    """ENS lookups backed by a SQLite cache that survives restarts"""
+
+    def __init__(
+        self,
+        path: str = ENS_CACHE_PATH,
+        ttl: float = ENS_TTL,
+        negative_ttl: float = ENS_NEGATIVE_TTL,
+        bens_url: str = BENS_URL,
+        chain_id: str = "1",
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.bens_url = bens_url
+        self.chain_id = chain_id
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS ens_names (
+                    name TEXT PRIMARY KEY,
+                    address TEXT,
+                    expires_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS ens_reverse (
+                    address TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                );
+                """
+            )
+        return self._db
+
+    def cached(self, name: str) -> Tuple[bool, Optional[str]]:
+        """Return (hit, address); a hit with address None is a cached negative"""
+        row = self.db.execute(
+            "SELECT address, expires_at FROM ens_names WHERE name = ?", (normalize_ens_name(name),)
+        ).fetchone()
+        if row is None or row[1] <= time.time():
+            return False, None
+        return True, row[0]
+
+    def primary_name(self, address: str) -> Optional[str]:
+        """Primary ENS name of an address, if Blockscout has reported one"""
+        row = self.db.execute(
+            "SELECT name, expires_at FROM ens_reverse WHERE address = ?", (address.lower(),)
+        ).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return row[0]
+
+    def remember(self, name: str, address: Optional[str]) -> None:
+        """Store a forward resolution (address None = does not resolve)"""
+        name = normalize_ens_name(name)
+        expires_at = time.time() + (self.ttl if address else self.negative_ttl)
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO ens_names (name, address, expires_at) VALUES (?, ?, ?)",
+                (name, address, expires_at),
+            )
+
+    def remember_primary(self, name: str, address: str) -> None:
+        """Store an address's primary name (ens_domain_name from address info)
+
+        Any number of names can resolve to an address, so forward lookups
+        never touch this index; a primary name also resolves forward.
+        """
+        self.remember(name, address)
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO ens_reverse (address, name, expires_at) VALUES (?, ?, ?)",
+                (address.lower(), normalize_ens_name(name), time.time() + self.ttl),
+            )
+
+    async def resolve(self, name: str) -> Optional[str]:
+        """Resolve an ENS name to an address (cache first, then BENS)"""
+        name = normalize_ens_name(name)
+        hit, address = self.cached(name)
+        if hit:
+            logger.info(f"⚡ ENS cache hit: {name} -> {address}")
+            return address
+
+        try:
+            data = await blockscout_client.get_json(f"{self.bens_url}/{self.chain_id}/domains/{name}")
+            address = (data.get("resolved_address") or {}).get("hash")
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 404:
+                raise
+            address = None
+
+        self.remember(name, address)
+        return address
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+# Shared resolver for the whole bot process
+ens_resolver = ENSResolver()
@@ -0,0 +1,247 @@
+"""
+BlockScout AI - Address history
+Pages through Blockscout address history (next_page_params) and folds it into
+a bounded-memory summary: counts, volumes per token, top counterparties and
+first/last seen
+"""
+
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, AsyncIterator, List, Optional
+
+from blockscout_client import blockscout_client
+
+# Pages fetched when a date range is given (50 items per page) vs. without one
+HISTORY_MAX_PAGES = int(os.getenv("HISTORY_MAX_PAGES", "40"))
+HISTORY_DEFAULT_PAGES = int(os.getenv("HISTORY_DEFAULT_PAGES", "1"))
+# Wall-time cap for one paged scan (seconds)
+HISTORY_TIME_BUDGET = float(os.getenv("HISTORY_TIME_BUDGET", "10"))
+
+# Memory bounds for the aggregator
+MAX_TRACKED_COUNTERPARTIES = 256
+MAX_TRACKED_TOKENS = 64
+SAMPLE_ITEMS = 10
+TOP_N = 5
+
+
+def _parse_time(value: Optional[str], end_of_day: bool = False) -> Optional[datetime]:
+    """ISO 8601 date or timestamp -> aware datetime (naive values are UTC)
+
+    A date-only value with end_of_day covers that whole day.
+    """
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if end_of_day and "T" not in value and " " not in value.strip():
+        parsed += timedelta(days=1, microseconds=-1)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+async def paginate(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    age_from: Optional[str] = None,
+    age_to: Optional[str] = None,
+    max_pages: int = HISTORY_MAX_PAGES,
+    time_budget: float = HISTORY_TIME_BUDGET,
+    stats: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield items across Blockscout pages, newest first, within [age_from, age_to]
+
+    Blockscout lists history newest first, so items after age_to are skipped
+    and the scan stops at the first item before age_from. `stats` (if given)
+    receives the page count and whether the scan was cut short.
+    """
+    stats = stats if stats is not None else {}
+    stats.update(pages=0, truncated=False)
+    start, end = _parse_time(age_from), _parse_time(age_to, end_of_day=True)
+    deadline = time.monotonic() + time_budget
+    query = dict(params or {})
+
+    while True:
+        page = await blockscout_client.get_json(url, params=query or None)
+        stats["pages"] += 1
+
+        for item in page.get("items") or []:
+            timestamp = _parse_time(item.get("timestamp"))
+            if timestamp and end and timestamp > end:
+                continue
+            if timestamp and start and timestamp < start:
+                return
+            yield item
+
+        next_page = page.get("next_page_params")
+        if not next_page:
+            return
+        if stats["pages"] >= max_pages or time.monotonic() >= deadline:
+            stats["truncated"] = True
+            return
+        query = {**(params or {}), **next_page}
+
+
+class _SpaceSaving:
+    """Approximate top-k counter in fixed memory (Space-Saving algorithm)"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+
+    def add(self, key: str) -> Optional[str]:
+        """Count key; returns the key it evicted, if any"""
+        if key in self.counts:
+            self.counts[key] += 1
+            return None
+        if len(self.counts) < self.capacity:
+            self.counts[key] = 1
+            return None
+        evicted = min(self.counts, key=self.counts.get)
+        self.counts[key] = self.counts.pop(evicted) + 1
+        return evicted
+
+    def top(self, n: int) -> List[tuple]:
+        return sorted(self.counts.items(), key=lambda item: -item[1])[:n]
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _scaled(raw: int, decimals: Any) -> float:
+    return round(raw / 10 ** (_to_int(decimals) if decimals is not None else 18), 6)
+
+
+class HistoryAggregator:
+    """Streaming summary of an address's transactions or token transfers"""
+
+    def __init__(self, address: str):
+        self.address = address.lower()
+        self.count = 0
+        self.incoming = 0
+        self.outgoing = 0
+        self.failed = 0
+        self.native_in = 0
+        self.native_out = 0
+        self.fees = 0
+        self.first_seen: Optional[str] = None
+        self.last_seen: Optional[str] = None
+        self.methods = _SpaceSaving(32)
+        self.counterparties = _SpaceSaving(MAX_TRACKED_COUNTERPARTIES)
+        self.token_transfers = _SpaceSaving(MAX_TRACKED_TOKENS)
+        self.tokens: Dict[str, Dict[str, Any]] = {}
+        self.sample: List[Dict[str, Any]] = []
+
+    def _direction(self, item: Dict[str, Any]) -> tuple:
+        """(is_outgoing, is_incoming, counterparty)"""
+        sender = ((item.get("from") or {}).get("hash") or "").lower()
+        receiver = ((item.get("to") or {}).get("hash") or "").lower()
+        outgoing, incoming = sender == self.address, receiver == self.address
+        counterparty = receiver if outgoing else sender
+        return outgoing, incoming, counterparty
+
+    def add(self, item: Dict[str, Any]) -> None:
+        """Fold one transaction or token transfer into the summary"""
+        self.count += 1
+        if len(self.sample) < SAMPLE_ITEMS:
+            self.sample.append(item)
+
+        timestamp = item.get("timestamp")
+        if timestamp:
+            self.first_seen = min(self.first_seen or timestamp, timestamp)
+            self.last_seen = max(self.last_seen or timestamp, timestamp)
+
+        outgoing, incoming, counterparty = self._direction(item)
+        self.outgoing += outgoing
+        self.incoming += incoming
+        if counterparty and counterparty != self.address:
+            self.counterparties.add(counterparty)
+        if item.get("method"):
+            self.methods.add(item["method"])
+
+        if "token" in item and "total" in item:
+            self._add_transfer(item, outgoing, incoming)
+        else:
+            self._add_transaction(item, outgoing, incoming)
+
+    def _add_transaction(self, item: Dict[str, Any], outgoing: bool, incoming: bool) -> None:
+        value = _to_int(item.get("value"))
+        if outgoing:
+            self.native_out += value
+            self.fees += _to_int((item.get("fee") or {}).get("value"))
+        if incoming:
+            self.native_in += value
+        if item.get("status") == "error":
+            self.failed += 1
+
+    def _add_transfer(self, item: Dict[str, Any], outgoing: bool, incoming: bool) -> None:
+        token = item.get("token") or {}
+        key = (token.get("address_hash") or token.get("address") or token.get("symbol") or "unknown").lower()
+        evicted = self.token_transfers.add(key)
+        if evicted:
+            self.tokens.pop(evicted, None)
+        stats = self.tokens.setdefault(key, {
+            "symbol": token.get("symbol"),
+            "decimals": (item.get("total") or {}).get("decimals") or token.get("decimals"),
+            "in": 0,
+            "out": 0,
+        })
+        value = _to_int((item.get("total") or {}).get("value"))
+        if outgoing:
+            stats["out"] += value
+        if incoming:
+            stats["in"] += value
+
+    def summary(self) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {
+            "count": self.count,
+            "incoming": self.incoming,
+            "outgoing": self.outgoing,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "top_counterparties": [
+                {"address": address, "count": count} for address, count in self.counterparties.top(TOP_N)
+            ],
+        }
+        if self.methods.counts:
+            summary["top_methods"] = dict(self.methods.top(TOP_N))
+        if self.tokens:
+            ranked = self.token_transfers.top(TOP_N * 2)
+            summary["tokens"] = [
+                {
+                    "token": self.tokens[key]["symbol"] or key,
+                    "transfers": count,
+                    "in": _scaled(self.tokens[key]["in"], self.tokens[key]["decimals"]),
+                    "out": _scaled(self.tokens[key]["out"], self.tokens[key]["decimals"]),
+                }
+                for key, count in ranked if key in self.tokens
+            ]
+        else:
+            summary.update(
+                failed=self.failed,
+                native_in=_scaled(self.native_in, 18),
+                native_out=_scaled(self.native_out, 18),
+                fees=_scaled(self.fees, 18),
+            )
+        return summary
+
+
+async def summarize_history(
+    url: str,
+    address: str,
+    params: Optional[Dict[str, Any]] = None,
+    age_from: Optional[str] = None,
+    age_to: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Page through an address history endpoint and return summary + newest items"""
+    max_pages = HISTORY_MAX_PAGES if (age_from or age_to) else HISTORY_DEFAULT_PAGES
+    aggregator = HistoryAggregator(address)
+    stats: Dict[str, Any] = {}
+    async for item in paginate(url, params, age_from, age_to, max_pages=max_pages, stats=stats):
+        aggregator.add(item)
+    return {
+        "summary": {**aggregator.summary(), "pages": stats["pages"], "truncated": stats["truncated"]},
+        "items": aggregator.sample,
+    }
@@ -0,0 +1,130 @@
+"""
+BlockScout AI - Prometheus metrics
+Request, stage latency, Blockscout, Claude token and cache metrics served on a
+local HTTP port for scraping
+"""
+
+import os
+import time
+import logging
+import functools
+from typing import Any, Callable, Dict
+
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+from prometheus_client.core import REGISTRY, GaugeMetricFamily
+
+from tracing import Span
+
+logger = logging.getLogger(__name__)
+
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # 0 = disabled
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+HANDLER_REQUESTS = Counter(
+    "bot_handler_requests_total", "Telegram updates handled", ["handler", "outcome"]
+)
+HANDLER_LATENCY = Histogram(
+    "bot_handler_seconds", "End-to-end handler latency", ["handler"], buckets=LATENCY_BUCKETS
+)
+HANDLERS_IN_PROGRESS = Gauge(
+    "bot_handlers_in_progress", "Handlers currently running", ["handler"]
+)
+STAGE_LATENCY = Histogram(
+    "bot_stage_seconds", "Latency per pipeline stage (trace span)", ["stage"], buckets=LATENCY_BUCKETS
+)
+BLOCKSCOUT_RESPONSES = Counter(
+    "blockscout_responses_total", "Blockscout HTTP responses", ["host", "status"]
+)
+BLOCKSCOUT_ERRORS = Counter(
+    "blockscout_errors_total", "Blockscout requests that raised (timeouts, connection errors)", ["host", "error"]
+)
+CLAUDE_CALLS = Counter(
+    "claude_calls_total", "Claude API calls", ["model", "stop_reason"]
+)
+CLAUDE_TOKENS = Counter(
+    "claude_tokens_total", "Claude tokens", ["model", "kind"]
+)
+
+TOKEN_KINDS = ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens")
+
+
+class MetricsExporter:
+    """Tracing exporter that turns finished spans into metrics"""
+
+    def export(self, span: Span) -> None:
+        STAGE_LATENCY.labels(span.name).observe(span.duration or 0.0)
+        attributes = span.attributes
+
+        if span.name == "blockscout.http":
+            host = attributes.get("host") or "unknown"
+            if "status" in attributes:
+                BLOCKSCOUT_RESPONSES.labels(host, str(attributes["status"])).inc()
+            elif span.error:
+                BLOCKSCOUT_ERRORS.labels(host, span.error.split(":", 1)[0]).inc()
+
+        elif span.name == "claude.call":
+            model = attributes.get("model", "unknown")
+            CLAUDE_CALLS.labels(model, attributes.get("stop_reason") or "error").inc()
+            for kind in TOKEN_KINDS:
+                if attributes.get(kind):
+                    CLAUDE_TOKENS.labels(model, kind).inc(attributes[kind])
+
+
+class StatsCollector:
+    """Exposes component stats() dicts (caches, single-flight, scheduler) as gauges"""
+
+    def __init__(self):
+        self.sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def collect(self):
+        for component, stats in self.sources.items():
+            try:
+                values = stats()
+            except Exception as e:
+                logger.warning(f"Stats for {component} failed: {e}")
+                continue
+            for name, value in values.items():
+                if isinstance(value, (int, float)):
+                    yield GaugeMetricFamily(f"bot_{component}_{name}", f"{component} {name}", value=value)
+
+
+stats_collector = StatsCollector()
+REGISTRY.register(stats_collector)
+
+
+def register_stats(component: str, stats: Callable[[], Dict[str, Any]]) -> None:
+    """Publish a component's stats() as bot_<component>_<stat> gauges"""
+    stats_collector.sources[component] = stats
+
+
+def counted(handler: Callable) -> Callable:
+    """Wrap a Telegram handler with request, latency and in-progress metrics"""
+    name = handler.__name__
+
+    @functools.wraps(handler)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started_at = time.perf_counter()
+        outcome = "ok"
+        HANDLERS_IN_PROGRESS.labels(name).inc()
+        try:
+            return await handler(*args, **kwargs)
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            HANDLERS_IN_PROGRESS.labels(name).dec()
+            HANDLER_LATENCY.labels(name).observe(time.perf_counter() - started_at)
+            HANDLER_REQUESTS.labels(name, outcome).inc()
+
+    return wrapper
+
+
+def start_metrics_server(port: int = METRICS_PORT, host: str = METRICS_HOST) -> bool:
+    """Serve /metrics on host:port (no-op when port is 0)"""
+    if not port:
+        return False
+    start_http_server(port, addr=host)
+    logger.info(f"📈 Metrics on http://{host}:{port}/metrics")
+    return True
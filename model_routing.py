@@ -0,0 +1,85 @@
+"""
+BlockScout AI - Model routing
+Picks the Claude model for each tool-loop call (small planner for tool
+selection, larger model for the final answer) and tracks per-model latency
+and token usage
+
+Routing is off unless CLAUDE_PLANNER_MODEL is set: it adds a planner round
+trip to every tool-using query, which only pays off when the planner model is
+much faster than the synthesis model (benchmarks/loadgen.py cannot show that).
+"""
+
+import os
+from typing import Dict
+
+CLAUDE_SYNTHESIS_MODEL = os.getenv("CLAUDE_SYNTHESIS_MODEL", "claude-sonnet-4-20250514")
+# Empty (or the synthesis model) disables routing, e.g. claude-3-5-haiku-20241022 enables it
+CLAUDE_PLANNER_MODEL = os.getenv("CLAUDE_PLANNER_MODEL", "")
+# Planner calls only pick tools, so their output is capped well below an answer
+CLAUDE_PLANNER_MAX_TOKENS = int(os.getenv("CLAUDE_PLANNER_MAX_TOKENS", "300"))
+# Query classes answered by the planner model end to end
+PLANNER_ONLY_CLASSES = {
+    name.strip() for name in os.getenv("CLAUDE_PLANNER_ONLY_CLASSES", "lookup").split(",") if name.strip()
+}
+
+# Appended to the system prompt on planner calls
+PLANNER_INSTRUCTION = (
+    "You are only choosing tools. Call the tools needed to answer the user. "
+    "When you have everything you need, reply with the single word DONE - "
+    "do not write the answer, another model writes it from the tool results."
+)
+
+
+class ModelRouter:
+    """Routing policy for one tool loop"""
+
+    def __init__(
+        self,
+        query_class: str,
+        prefetched: bool = False,
+        planner_model: str = CLAUDE_PLANNER_MODEL,
+        synthesis_model: str = CLAUDE_SYNTHESIS_MODEL,
+        planner_only_classes: set = PLANNER_ONLY_CLASSES,
+    ):
+        self.planner_model = planner_model or synthesis_model
+        self.synthesis_model = synthesis_model
+        self.enabled = self.planner_model != self.synthesis_model
+        self.planner_only = self.enabled and query_class in planner_only_classes
+        # Prefetched data is usually enough to answer at once, so skip planning
+        self.prefetched = prefetched
+
+    @property
+    def splits_synthesis(self) -> bool:
+        """Planner picks tools and replies DONE; the synthesis model writes the answer"""
+        return self.enabled and not self.planner_only and not self.prefetched
+
+    def plans(self, final: bool) -> bool:
+        """Whether the next call is a (tool-picking only) planner call"""
+        return self.splits_synthesis and not final
+
+    def model_for(self, final: bool) -> str:
+        """Model for the next call; final calls must answer without tools"""
+        if self.planner_only:
+            return self.planner_model
+        return self.planner_model if self.plans(final) else self.synthesis_model
+
+
+class ModelStats:
+    """Per-model call count, latency and token totals for one request"""
+
+    def __init__(self):
+        self.models: Dict[str, Dict[str, float]] = {}
+
+    def record(self, model: str, latency: float, usage: Dict[str, int]) -> None:
+        stats = self.models.setdefault(model, {"calls": 0, "latency": 0.0})
+        stats["calls"] += 1
+        stats["latency"] += latency
+        for name, value in usage.items():
+            stats[name] = stats.get(name, 0) + value
+
+    def summary(self) -> str:
+        return "; ".join(
+            f"{model}: {stats['calls']:.0f} call(s), {stats['latency']:.2f}s, "
+            f"in={stats.get('input_tokens', 0):.0f}, out={stats.get('output_tokens', 0):.0f}"
+            for model, stats in self.models.items()
+        )
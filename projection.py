@@ -0,0 +1,236 @@
+"""
+BlockScout AI - Tool result projection
+Keeps only the Blockscout fields the analysis needs and renders them compactly
+before they are sent to Claude
+"""
+
+import json
+from typing import Dict, Any, List, Callable
+
+from valuation import value_holdings
+
+# Rows kept per list result and limits for long values
+MAX_ROWS = 10
+MAX_STRING_CHARS = 300
+MAX_SOURCE_CHARS = 6000
+MAX_RESULT_CHARS = 6000
+
+# Field paths per Blockscout object (old and new v2 names are both listed)
+ADDRESS_FIELDS = [
+    "hash", "name", "ens_domain_name", "is_contract", "is_verified", "coin_balance",
+    "exchange_rate", "token.symbol", "token.name", "token.type", "token.holders",
+    "token.holders_count", "proxy_type", "implementations", "creator_address_hash",
+    "has_tokens", "has_token_transfers",
+]
+TOKEN_FIELDS = [
+    "address", "address_hash", "name", "symbol", "type", "decimals", "exchange_rate",
+    "holders", "holders_count", "total_supply", "circulating_market_cap", "volume_24h",
+]
+TRANSACTION_FIELDS = [
+    "hash", "timestamp", "block", "block_number", "from.hash", "to.hash", "value",
+    "fee.value", "method", "status", "result", "transaction_types", "tx_types",
+]
+TRANSACTION_DETAIL_FIELDS = TRANSACTION_FIELDS + [
+    "decoded_input.method_call", "decoded_input.parameters", "gas_used", "gas_price",
+    "nonce", "confirmations", "revert_reason", "created_contract.hash",
+]
+TRANSFER_FIELDS = [
+    "timestamp", "transaction_hash", "tx_hash", "from.hash", "to.hash", "token.symbol",
+    "token.address", "token.address_hash", "total.value", "total.decimals", "type", "method",
+]
+NFT_FIELDS = [
+    "id", "token_type", "value", "token.name", "token.symbol", "token.address", "token.address_hash",
+]
+BLOCK_FIELDS = [
+    "height", "hash", "timestamp", "transaction_count", "tx_count", "gas_used", "gas_limit",
+    "base_fee_per_gas", "miner.hash", "size",
+]
+LOG_FIELDS = ["index", "address.hash", "decoded.method_call", "decoded.parameters"]
+SEARCH_FIELDS = [
+    "name", "symbol", "address", "address_hash", "token_type", "exchange_rate",
+    "is_smart_contract_verified", "total_supply",
+]
+CHAIN_FIELDS = ["chain_id", "name"]
+CONTRACT_FIELDS = [
+    "name", "is_verified", "language", "compiler_version", "optimization_enabled",
+    "proxy_type", "implementations", "files",
+]
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _get_path(obj: Any, path: str) -> Any:
+    """Resolve a dotted path ("token.symbol") inside nested dicts"""
+    for part in path.split("."):
+        if not isinstance(obj, dict):
+            return None
+        obj = obj.get(part)
+    return obj
+
+
+def _squeeze(value: Any, max_string: int = MAX_STRING_CHARS) -> Any:
+    """Drop empty values, cap nested lists and shorten long strings"""
+    if isinstance(value, dict):
+        return {k: _squeeze(v, max_string) for k, v in value.items() if not _is_empty(v)}
+    if isinstance(value, list):
+        return [_squeeze(v, max_string) for v in value[:MAX_ROWS]]
+    if isinstance(value, str) and len(value) > max_string:
+        return value[:max_string] + "…"
+    return value
+
+
+def project_fields(obj: Any, fields: List[str]) -> Dict[str, Any]:
+    """Keep only the listed field paths, flattened to "a.b" keys"""
+    if not isinstance(obj, dict):
+        return {}
+    projected = {}
+    for field in fields:
+        value = _get_path(obj, field)
+        if not _is_empty(value):
+            projected[field] = _squeeze(value)
+    return projected
+
+
+def project_table(items: Any, fields: List[str], more: bool = False, limit: int = MAX_ROWS) -> Dict[str, Any]:
+    """Render a list of objects as a compact column/row table"""
+    items = items if isinstance(items, list) else []
+    rows = [project_fields(item, fields) for item in items[:limit]]
+    columns = [field for field in fields if any(field in row for row in rows)]
+    table = {
+        "columns": columns,
+        "rows": [[row.get(column) for column in columns] for row in rows],
+        "count": len(items),
+    }
+    if more or len(items) > limit:
+        table["more"] = True
+    return table
+
+
+def _fields(fields: List[str]) -> Callable[[Any], Any]:
+    """Projection for single-object results"""
+    return lambda result: project_fields(result, fields)
+
+
+def _items(fields: List[str]) -> Callable[[Any], Any]:
+    """Projection for paginated {"items": [...]} results"""
+    return lambda result: project_table(
+        result.get("items"), fields, more=bool(result.get("next_page_params"))
+    )
+
+
+def _history(fields: List[str]) -> Callable[[Any], Any]:
+    """Projection for paged history results: newest rows plus the period summary"""
+    def project(result: Dict[str, Any]) -> Dict[str, Any]:
+        summary = result.get("summary") or {}
+        table = project_table(
+            result.get("items"), fields, more=summary.get("count", 0) > len(result.get("items") or [])
+        )
+        table["summary"] = summary
+        return table
+    return project
+
+
+def _project_holdings(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Token holdings valued in USD (balances already decimals-adjusted)"""
+    table = value_holdings(result.get("items"), limit=MAX_ROWS)
+    if result.get("next_page_params") or table["count"] > len(table["rows"]):
+        table["more"] = True
+    return table
+
+
+def _abi_signatures(abi: Any) -> List[str]:
+    """Collapse a JSON ABI into one-line signatures"""
+    signatures = []
+    for entry in abi if isinstance(abi, list) else []:
+        kind = entry.get("type", "function")
+        inputs = ",".join(i.get("type", "") for i in entry.get("inputs") or [])
+        signature = f"{kind} {entry.get('name', '')}({inputs})".replace(" (", "(")
+        if kind == "function":
+            outputs = ",".join(o.get("type", "") for o in entry.get("outputs") or [])
+            signature += f" {entry.get('stateMutability', '')}"
+            if outputs:
+                signature += f" returns({outputs})"
+        signatures.append(signature.strip())
+    return signatures
+
+
+def _project_contract_abi(result: Dict[str, Any]) -> Dict[str, Any]:
+    projected = project_fields(result, ["name", "is_verified"])
+    projected["abi"] = _abi_signatures(result.get("abi"))
+    return projected
+
+
+def _project_contract_code(result: Dict[str, Any]) -> Dict[str, Any]:
+    projected = project_fields(result, CONTRACT_FIELDS + ["file_name"])
+    source = result.get("source_code")
+    if source:
+        projected["source_code"] = _squeeze(source, MAX_SOURCE_CHARS)
+    return projected
+
+
+def _project_transaction(result: Dict[str, Any]) -> Dict[str, Any]:
+    projected = project_fields(result, TRANSACTION_DETAIL_FIELDS)
+    if result.get("token_transfers"):
+        projected["token_transfers"] = project_table(result["token_transfers"], TRANSFER_FIELDS)
+    return projected
+
+
+def _project_ens(result: Dict[str, Any]) -> Dict[str, Any]:
+    projected = project_fields(result, ["address", "ens_name", "resolved"])
+    if isinstance(result.get("data"), dict):
+        projected["data"] = project_fields(result["data"], ADDRESS_FIELDS)
+    return projected
+
+
+# Tool name -> projection; tools without an entry are squeezed generically
+TOOL_PROJECTIONS = {
+    "get_address_info": _fields(ADDRESS_FIELDS),
+    "get_address_by_ens_name": _project_ens,
+    "get_tokens_by_address": _project_holdings,
+    "get_token_info": _fields(TOKEN_FIELDS),
+    "get_transactions_by_address": _history(TRANSACTION_FIELDS),
+    "get_token_transfers_by_address": _history(TRANSFER_FIELDS),
+    "nft_tokens_by_address": _items(NFT_FIELDS),
+    "lookup_token_by_symbol": _items(SEARCH_FIELDS),
+    "get_latest_block": lambda result: {"latest_block": project_fields(result.get("latest_block"), BLOCK_FIELDS)},
+    "get_block_info": _fields(BLOCK_FIELDS),
+    "get_transaction_info": _project_transaction,
+    "get_transaction_logs": _items(LOG_FIELDS),
+    "get_contract_abi": _project_contract_abi,
+    "inspect_contract_code": _project_contract_code,
+    "get_chains_list": lambda result: project_table(result.get("items"), CHAIN_FIELDS, limit=len(result.get("items") or [])),
+}
+
+
+def compact_json(value: Any) -> str:
+    """Serialize without whitespace"""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def project_result(tool_name: str, result: Any) -> Any:
+    """Apply the tool's projection (errors pass through untouched)"""
+    if not isinstance(result, dict) or "error" in result:
+        return result
+    projection = TOOL_PROJECTIONS.get(tool_name)
+    return projection(result) if projection else _squeeze(result)
+
+
+def render_tool_result(tool_name: str, result: Any, max_chars: int = MAX_RESULT_CHARS) -> str:
+    """Project a tool result and serialize it within max_chars
+
+    Oversized tables lose trailing rows so the output always stays valid JSON.
+    """
+    projected = project_result(tool_name, result)
+    text = compact_json(projected)
+
+    rows = projected.get("rows") if isinstance(projected, dict) else None
+    while len(text) > max_chars and rows and len(rows) > 1:
+        rows.pop()
+        projected["more"] = True
+        text = compact_json(projected)
+
+    if len(text) > max_chars:
+        text = compact_json({"truncated": True, "preview": text[:max_chars]})
+    return text
@@ -0,0 +1,157 @@
+"""
+BlockScout AI - Admission control
+Per-chat token buckets, a global in-flight cap and a round-robin queue across
+chats for Claude-backed handlers
+"""
+
+import time
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerBusy(Exception):
+    """Request rejected by admission control (reason: "rate_limited" or "busy")"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def try_take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class FairScheduler:
+    """Admission scheduler for expensive handlers
+
+    At most `max_in_flight` requests run at once. Extra requests wait in
+    per-chat queues that are served round-robin, so one busy chat cannot
+    starve the others. Requests over a chat's rate, over the queue limits
+    or waiting longer than `max_wait` are rejected with SchedulerBusy.
+    """
+
+    # Idle buckets are pruned once this many chats have been seen
+    MAX_BUCKETS = 10000
+
+    def __init__(
+        self,
+        max_in_flight: int = 8,
+        max_queued: int = 32,
+        max_queued_per_chat: int = 2,
+        rate_per_minute: float = 6,
+        burst: int = 3,
+        max_wait: float = 20.0,
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.max_queued_per_chat = max_queued_per_chat
+        self.rate = rate_per_minute / 60
+        self.burst = burst
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.rejected = 0
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        self._queues: "OrderedDict[Hashable, Deque[asyncio.Future]]" = OrderedDict()
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    @asynccontextmanager
+    async def admit(self, chat_id: Hashable) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block (raises SchedulerBusy)"""
+        await self._acquire(chat_id)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, chat_id: Hashable) -> None:
+        bucket = self._buckets.get(chat_id)
+        if bucket is None:
+            if len(self._buckets) >= self.MAX_BUCKETS:
+                self._prune_buckets()
+            bucket = self._buckets[chat_id] = TokenBucket(self.rate, self.burst)
+        if not bucket.try_take():
+            self.rejected += 1
+            raise SchedulerBusy("rate_limited")
+
+        if self.in_flight < self.max_in_flight and not self._queues:
+            self.in_flight += 1
+            return
+
+        queue = self._queues.get(chat_id)
+        if self.queued >= self.max_queued or (queue and len(queue) >= self.max_queued_per_chat):
+            self.rejected += 1
+            raise SchedulerBusy("busy")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(chat_id, deque()).append(waiter)
+        try:
+            async with asyncio.timeout(self.max_wait):
+                await waiter  # resolved by _release, which hands over its slot
+        except (TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed to us as we gave up - pass it on
+                self._release()
+            else:
+                self._remove_waiter(chat_id, waiter)
+            if isinstance(e, TimeoutError):
+                self.rejected += 1
+                raise SchedulerBusy("busy") from None
+            raise
+
+    def _release(self) -> None:
+        """Hand the slot to the next chat in round-robin order, or free it"""
+        while self._queues:
+            chat_id, queue = self._queues.popitem(last=False)
+            waiter = queue.popleft()
+            if queue:
+                self._queues[chat_id] = queue  # back of the rotation
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _prune_buckets(self) -> None:
+        """Forget chats whose buckets have refilled completely"""
+        now = time.monotonic()
+        refill_time = self.burst / self.rate if self.rate else float("inf")
+        self._buckets = {
+            chat_id: bucket for chat_id, bucket in self._buckets.items()
+            if now - bucket.updated < refill_time
+        }
+
+    def _remove_waiter(self, chat_id: Hashable, waiter: asyncio.Future) -> None:
+        queue = self._queues.get(chat_id)
+        if queue and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[chat_id]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "rejected": self.rejected,
+        }
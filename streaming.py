@@ -0,0 +1,106 @@
+"""
+BlockScout AI - Streaming replies
+Shows Claude's answer in Telegram while it is generated by editing a
+placeholder message with rate-limited updates
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Callable, Optional
+
+from telegram import Message
+from telegram.error import BadRequest, RetryAfter, TelegramError
+
+from telegram_format import TELEGRAM_MESSAGE_LIMIT, split_message
+
+logger = logging.getLogger(__name__)
+
+# Telegram tolerates roughly one edit per second per chat
+STREAM_EDIT_INTERVAL = float(os.getenv("STREAM_EDIT_INTERVAL", "1.0"))
+PLACEHOLDER_TEXT = "🔍 Analyzing blockchain data…"
+CURSOR = " ▌"
+
+
+class TelegramStreamer:
+    """Progressively edits one placeholder message as text deltas arrive"""
+
+    def __init__(
+        self,
+        message: Message,
+        formatter: Callable[[str], str] = lambda text: text,
+        min_interval: float = STREAM_EDIT_INTERVAL,
+        placeholder: str = PLACEHOLDER_TEXT,
+    ):
+        self.message = message
+        self.formatter = formatter
+        self.min_interval = min_interval
+        self.placeholder = placeholder
+        self._reply: Optional[Message] = None
+        self._buffer = ""
+        self._shown = ""
+        self._last_edit = 0.0
+        self._blocked_until = 0.0
+
+    async def start(self) -> None:
+        """Send the placeholder message that later edits will replace"""
+        self._reply = await self.message.reply_text(self.placeholder, parse_mode=None)
+        self._shown = self.placeholder
+
+    async def push(self, delta: str) -> None:
+        """Append a text delta and refresh the message if the rate limit allows"""
+        self._buffer += delta
+        now = time.monotonic()
+        if now - self._last_edit < self.min_interval or now < self._blocked_until:
+            return
+        preview = self.formatter(self._buffer).strip()
+        if preview:
+            await self._edit(preview[:TELEGRAM_MESSAGE_LIMIT - len(CURSOR)] + CURSOR)
+
+    async def reset(self) -> None:
+        """Discard streamed text (the iteration ended in tool use, not an answer)"""
+        self._buffer = ""
+        if self._shown != self.placeholder:
+            await self._edit(self.placeholder)
+
+    async def finish(self, final_text: str) -> None:
+        """Replace the placeholder with the final answer (overflow goes in follow-up messages)"""
+        if self._reply is None:
+            await reply_in_chunks(self.message, final_text)
+            return
+        first, *rest = split_message(final_text) or [final_text]
+        await self._edit(first, force=True)
+        for chunk in rest:
+            await self.message.reply_text(chunk, parse_mode=None)
+
+    async def _edit(self, text: str, force: bool = False) -> None:
+        if self._reply is None or text == self._shown:
+            return
+        try:
+            await self._reply.edit_text(text, parse_mode=None)
+            self._shown = text
+        except RetryAfter as e:
+            # Flood control: pause previews, but the final answer must land
+            self._blocked_until = time.monotonic() + float(e.retry_after)
+            if force:
+                await asyncio.sleep(float(e.retry_after))
+                await self._reply.edit_text(text, parse_mode=None)
+                self._shown = text
+        except BadRequest as e:
+            if "not modified" not in str(e).lower():
+                logger.warning(f"Streaming edit failed: {e}")
+                if force:
+                    raise
+        except TelegramError as e:
+            logger.warning(f"Streaming edit failed: {e}")
+            if force:
+                raise
+        finally:
+            self._last_edit = time.monotonic()
+
+
+async def reply_in_chunks(message: Message, text: str) -> None:
+    """Reply with text split at section boundaries to fit Telegram's limit"""
+    for chunk in split_message(text) or [text]:
+        await message.reply_text(chunk, parse_mode=None)
@@ -0,0 +1,78 @@
+"""
+BlockScout AI - Telegram formatting
+Shared formatter for Claude answers and splitting at Telegram's message limit
+"""
+
+import re
+from typing import List
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+# Section label -> header it becomes (each section starts after a blank line)
+SECTION_HEADERS = {
+    "Address:": "📍 Address:",
+    "Token:": "🪙 Token:",
+    "Holders:": "👥 Holders:",
+    "24h Volume:": "📊 Volume:",
+    "Recent Activity:": "🔍 Activity:",
+    "Risk:": "⚠️ Risk:",
+    "Key Insights:": "💡 Insights:",
+}
+
+# (label, replacement) pairs applied in order; str.replace runs in C, which
+# measured faster than a single regex pass with a Python callback
+_SECTION_REPLACEMENTS = [(label, "\n\n" + header) for label, header in SECTION_HEADERS.items()]
+_BLANK_RUNS = re.compile(r"\n\n\n+")  # literal prefix lets re use its fast search
+
+
+def format_for_telegram(text: str) -> str:
+    """Telegram formatting: strip markdown, put sections and bullets on their own lines"""
+    # Remove markdown
+    text = text.replace("**", "").replace("••", "")
+
+    # Line breaks before sections, each bullet on a new line
+    for label, replacement in _SECTION_REPLACEMENTS:
+        text = text.replace(label, replacement)
+    text = text.replace("•", "\n•")
+
+    # Collapse blank-line runs in one scan
+    return _BLANK_RUNS.sub("\n\n", text)
+
+
+def split_message(text: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[str]:
+    """Split text into Telegram-sized chunks, preferring section then line boundaries"""
+    if len(text) <= limit:
+        return [text]
+
+    chunks: List[str] = []
+    current = ""
+    for section in text.split("\n\n"):
+        candidate = f"{current}\n\n{section}" if current else section
+        if len(candidate) <= limit:
+            current = candidate
+            continue
+        if current:
+            chunks.append(current)
+            current = ""
+        if len(section) <= limit:
+            current = section
+            continue
+
+        # Oversized section: pack it line by line, hard-cutting overlong lines
+        for line in section.split("\n"):
+            while len(line) > limit:
+                if current:
+                    chunks.append(current)
+                    current = ""
+                chunks.append(line[:limit])
+                line = line[limit:]
+            candidate = f"{current}\n{line}" if current else line
+            if len(candidate) <= limit:
+                current = candidate
+            else:
+                chunks.append(current)
+                current = line
+
+    if current:
+        chunks.append(current)
+    return [chunk for chunk in chunks if chunk.strip()]
@@ -0,0 +1,171 @@
+"""
+BlockScout AI - Request tracing
+Lightweight spans for the Telegram -> Claude -> Blockscout pipeline, exported
+as JSON lines and/or kept in memory for latency breakdowns
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACE_FILE = os.getenv("TRACE_FILE", "")
+TRACE_BUFFER_SPANS = int(os.getenv("TRACE_BUFFER_SPANS", "5000"))
+
+# Span of the code currently running (tasks inherit it from their creator)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation within a trace"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "duration", "attributes", "error")
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+        self.duration: Optional[float] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration_ms": round((self.duration or 0.0) * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class JsonLinesExporter:
+    """Appends each finished span to a file as one JSON object per line"""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a", buffering=1)
+
+    def export(self, span: Span) -> None:
+        self._file.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class InMemoryExporter:
+    """Keeps the most recent spans for in-process latency breakdowns"""
+
+    def __init__(self, max_spans: Optional[int] = TRACE_BUFFER_SPANS):
+        self.spans: deque = deque(maxlen=max_spans)
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def breakdown(self, root_name: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Latency percentiles (ms) per span name, optionally only within traces rooted at root_name"""
+        spans = list(self.spans)
+        if root_name:
+            traces = {s.trace_id for s in spans if s.parent_id is None and s.name == root_name}
+            spans = [s for s in spans if s.trace_id in traces]
+
+        durations: Dict[str, List[float]] = {}
+        for span in spans:
+            durations.setdefault(span.name, []).append((span.duration or 0.0) * 1000)
+
+        report = {}
+        for name, values in durations.items():
+            values.sort()
+            report[name] = {
+                "count": len(values),
+                "p50": _percentile(values, 0.50),
+                "p95": _percentile(values, 0.95),
+                "max": values[-1],
+            }
+        return report
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+# Always keep recent spans in memory; add a JSON lines file when TRACE_FILE is set
+memory_exporter = InMemoryExporter()
+exporters: List[Any] = [memory_exporter]
+if TRACE_FILE:
+    exporters.append(JsonLinesExporter(TRACE_FILE))
+
+
+@contextmanager
+def trace_span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Time a block as a child of the current span (or as a new trace root)"""
+    span = Span(name, _current_span.get(), attributes)
+    token = _current_span.set(span)
+    started_at = time.perf_counter()
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        span.duration = time.perf_counter() - started_at
+        _current_span.reset(token)
+        for exporter in exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.warning(f"Trace export failed: {e}")
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def close_exporters() -> None:
+    for exporter in exporters:
+        if hasattr(exporter, "close"):
+            exporter.close()
+
+
+def load_trace_file(path: str) -> InMemoryExporter:
+    """Rebuild an in-memory view of a JSON lines trace file"""
+    exporter = InMemoryExporter(max_spans=None)
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            span = Span.__new__(Span)
+            span.name = record["name"]
+            span.trace_id = record["trace_id"]
+            span.span_id = record["span_id"]
+            span.parent_id = record["parent_id"]
+            span.start = record["start"]
+            span.duration = record["duration_ms"] / 1000
+            span.attributes = record["attributes"]
+            span.error = record["error"]
+            exporter.export(span)
+    return exporter
+
+
+if __name__ == "__main__":
+    # python tracing.py traces.jsonl [telegram.analyze_command]
+    import sys
+
+    report = load_trace_file(sys.argv[1]).breakdown(sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"{'span':32} {'count':>7} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}")
+    for name, row in sorted(report.items(), key=lambda item: -item[1]["p95"]):
+        print(f"{name:32} {row['count']:>7} {row['p50']:>10.1f} {row['p95']:>10.1f} {row['max']:>10.1f}")
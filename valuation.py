@@ -0,0 +1,98 @@
+"""
+BlockScout AI - Portfolio valuation
+Decimals-correct balances, USD values, portfolio shares and concentration for
+a get_tokens_by_address item list, computed in one vectorized pass
+"""
+
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+# Token standards whose raw value is already a count (no decimals)
+COUNT_TOKEN_TYPES = {"ERC-721", "ERC-1155", "ERC-404"}
+DEFAULT_DECIMALS = 18
+VALUATION_COLUMNS = ["symbol", "address", "type", "balance", "price_usd", "value_usd", "share"]
+
+
+def token_decimals(token: Dict[str, Any]) -> int:
+    """Token decimals from Blockscout metadata (18 when unknown, 0 for NFTs)"""
+    if token.get("type") in COUNT_TOKEN_TYPES:
+        return 0
+    try:
+        return int(token.get("decimals"))
+    except (TypeError, ValueError):
+        return DEFAULT_DECIMALS
+
+
+def token_amount(raw: Any, decimals: int) -> float:
+    """Raw integer amount -> token units"""
+    try:
+        return int(raw) / 10 ** decimals
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def value_holdings(items: Any, limit: Optional[int] = None) -> Dict[str, Any]:
+    """Value a token holdings list and return a compact table sorted by USD value
+
+    Tokens without a price keep a balance but no value/share. Concentration
+    metrics cover priced tokens only: hhi (sum of squared shares), the
+    effective number of holdings (1 / hhi) and the largest holding's share.
+    """
+    items = [item for item in items if isinstance(item, dict)] if isinstance(items, list) else []
+    tokens = [item.get("token") or {} for item in items]
+
+    # Raw values can exceed int64, so scale them with Python ints before going to floats
+    decimals = [token_decimals(token) for token in tokens]
+    balances = np.array([token_amount(item.get("value"), d) for item, d in zip(items, decimals)], dtype=float)
+    prices = np.array([_float(token.get("exchange_rate")) for token in tokens], dtype=float)
+
+    values = balances * prices
+    priced = ~np.isnan(values)
+    total = float(values[priced].sum()) if priced.any() else 0.0
+    shares = values / total if total > 0 else np.full_like(values, np.nan)
+
+    order = np.argsort(np.where(priced, -values, np.inf), kind="stable")
+    if limit is not None:
+        order = order[:limit]
+
+    rows = []
+    for i in order:
+        token = tokens[i]
+        rows.append([
+            token.get("symbol") or token.get("name"),
+            token.get("address_hash") or token.get("address"),
+            token.get("type"),
+            round(float(balances[i]), 6),
+            None if np.isnan(prices[i]) else float(prices[i]),
+            None if np.isnan(values[i]) else round(float(values[i]), 2),
+            None if np.isnan(shares[i]) else round(float(shares[i]), 4),
+        ])
+
+    priced_shares = shares[~np.isnan(shares)]
+    hhi = float(np.square(priced_shares).sum()) if priced_shares.size else 0.0
+    return {
+        "columns": VALUATION_COLUMNS,
+        "rows": rows,
+        "count": len(items),
+        "priced": int(priced.sum()),
+        "total_usd": round(total, 2),
+        "concentration": {
+            "hhi": round(hhi, 4),
+            "effective_holdings": round(1 / hhi, 2) if hhi else 0.0,
+            "top_share": round(float(priced_shares.max()), 4) if priced_shares.size else 0.0,
+        },
+    }
+
+
+def top_holdings(portfolio: Dict[str, Any], n: int = 3) -> List[Dict[str, Any]]:
+    """First n rows with a portfolio share as dicts (none when nothing is worth anything)"""
+    holdings = [dict(zip(portfolio["columns"], row)) for row in portfolio["rows"][:n]]
+    return [holding for holding in holdings if holding["share"] is not None]
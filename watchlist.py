@@ -0,0 +1,254 @@
+"""
+BlockScout AI - Address watchlists
+Per-chat watched addresses in SQLite and a background poller that sweeps each
+chain from a block cursor in batched, rate-limited rounds and pushes alerts
+"""
+
+import os
+import time
+import asyncio
+import sqlite3
+import logging
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+
+from blockscout_client import blockscout_client
+from scheduler import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.getenv("BOT_DATA_DIR", "data")
+WATCHLIST_PATH = os.getenv("WATCHLIST_PATH", os.path.join(DATA_DIR, "watchlist.sqlite3"))
+WATCH_POLL_INTERVAL = float(os.getenv("WATCH_POLL_INTERVAL", "60"))
+WATCH_BATCH_SIZE = int(os.getenv("WATCH_BATCH_SIZE", "10"))
+WATCH_RATE_PER_SECOND = float(os.getenv("WATCH_RATE_PER_SECOND", "5"))
+WATCH_MAX_PER_CHAT = int(os.getenv("WATCH_MAX_PER_CHAT", "20"))
+# Transactions listed in one alert
+ALERT_MAX_TRANSACTIONS = 3
+
+
+class Watchlist:
+    """Watched (chat, address, chain) rows and per-address block cursors"""
+
+    def __init__(self, path: str = WATCHLIST_PATH):
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS watches (
+                    chat_id INTEGER NOT NULL,
+                    address TEXT NOT NULL,
+                    chain_id TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (chat_id, address, chain_id)
+                );
+                CREATE INDEX IF NOT EXISTS watches_by_chain ON watches (chain_id, address);
+                CREATE TABLE IF NOT EXISTS address_cursors (
+                    chain_id TEXT NOT NULL,
+                    address TEXT NOT NULL,
+                    block_number INTEGER NOT NULL,
+                    PRIMARY KEY (chain_id, address)
+                );
+                """
+            )
+        return self._db
+
+    def add(self, chat_id: int, address: str, chain_id: str) -> bool:
+        """Watch an address; False if the chat is at WATCH_MAX_PER_CHAT"""
+        if len(self.for_chat(chat_id)) >= WATCH_MAX_PER_CHAT:
+            return False
+        with self.db:
+            self.db.execute(
+                "INSERT OR IGNORE INTO watches (chat_id, address, chain_id, created_at) VALUES (?, ?, ?, ?)",
+                (chat_id, address.lower(), chain_id, time.time()),
+            )
+        return True
+
+    def remove(self, chat_id: int, address: Optional[str] = None, chain_id: Optional[str] = None) -> int:
+        """Stop watching (all chains when chain_id is None, everything when address is None)"""
+        query, args = "DELETE FROM watches WHERE chat_id = ?", [chat_id]
+        if address:
+            query += " AND address = ?"
+            args.append(address.lower())
+        if chain_id:
+            query += " AND chain_id = ?"
+            args.append(chain_id)
+        with self.db:
+            removed = self.db.execute(query, args).rowcount
+            # Unwatched addresses lose their cursor so a later watch starts at the head
+            self.db.execute(
+                "DELETE FROM address_cursors WHERE NOT EXISTS (SELECT 1 FROM watches w "
+                "WHERE w.chain_id = address_cursors.chain_id AND w.address = address_cursors.address)"
+            )
+        return removed
+
+    def for_chat(self, chat_id: int) -> List[Tuple[str, str]]:
+        """(address, chain_id) pairs watched by a chat"""
+        return self.db.execute(
+            "SELECT address, chain_id FROM watches WHERE chat_id = ? ORDER BY created_at", (chat_id,)
+        ).fetchall()
+
+    def by_chain(self) -> Dict[str, Dict[str, List[int]]]:
+        """{chain_id: {address: [chat_id, ...]}} for one sweep"""
+        chains: Dict[str, Dict[str, List[int]]] = {}
+        for chat_id, address, chain_id in self.db.execute("SELECT chat_id, address, chain_id FROM watches"):
+            chains.setdefault(chain_id, {}).setdefault(address, []).append(chat_id)
+        return chains
+
+    def cursors(self, chain_id: str) -> Dict[str, int]:
+        """{address: last swept block} for one chain"""
+        return dict(self.db.execute(
+            "SELECT address, block_number FROM address_cursors WHERE chain_id = ?", (chain_id,)
+        ).fetchall())
+
+    def set_cursor(self, chain_id: str, address: str, block_number: int) -> None:
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO address_cursors (chain_id, address, block_number) VALUES (?, ?, ?)",
+                (chain_id, address, block_number),
+            )
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def _block_number(item: Dict[str, Any]) -> int:
+    return int(item.get("block_number") or item.get("block") or 0)
+
+
+def format_alert(address: str, chain_id: str, chain_name: str, transactions: List[Dict[str, Any]]) -> str:
+    """Short push message for new activity (no Claude involved)"""
+    lines = [f"🔔 New activity on {address[:8]}…{address[-6:]} ({chain_name}): {len(transactions)} transaction(s)"]
+    for tx in transactions[:ALERT_MAX_TRANSACTIONS]:
+        sender = ((tx.get("from") or {}).get("hash") or "").lower()
+        direction = "➡️ Sent" if sender == address else "⬅️ Received"
+        value = int(tx.get("value") or 0) / 10**18
+        action = tx.get("method") or "transfer"
+        lines.append(f"• {direction} {value:.4g} native · {action} · block {_block_number(tx)}")
+    if len(transactions) > ALERT_MAX_TRANSACTIONS:
+        lines.append(f"• …and {len(transactions) - ALERT_MAX_TRANSACTIONS} more")
+    lines.append(f"\nAsk for an explanation: /analyze {address} {chain_id}")
+    return "\n".join(lines)
+
+
+class WatchPoller:
+    """Background sweeps: one latest-block probe per chain, then batched address fetches
+
+    A chain whose head has not moved past any address cursor costs one
+    request. Otherwise each behind address is fetched once (however many
+    chats watch it), WATCH_BATCH_SIZE at a time under a shared token bucket,
+    and transactions in (cursor, head] are pushed to the watching chats.
+    An address's cursor only advances once its fetch succeeded, and a new
+    watch starts at the current head.
+    """
+
+    def __init__(
+        self,
+        watchlist: Watchlist,
+        api_url: Callable[[str], Awaitable[Optional[str]]],
+        notify: Callable[[int, str], Awaitable[None]],
+        chain_name: Callable[[str], str] = str,
+        interval: float = WATCH_POLL_INTERVAL,
+        batch_size: int = WATCH_BATCH_SIZE,
+        rate_per_second: float = WATCH_RATE_PER_SECOND,
+    ):
+        self.watchlist = watchlist
+        self.api_url = api_url
+        self.notify = notify
+        self.chain_name = chain_name
+        self.interval = interval
+        self.batch_size = batch_size
+        self.bucket = TokenBucket(rate_per_second, max(1.0, rate_per_second))
+        self._task: Optional[asyncio.Task] = None
+
+    async def _take(self) -> None:
+        while not self.bucket.try_take():
+            await asyncio.sleep(1 / self.bucket.rate)
+
+    async def _get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        await self._take()
+        return await blockscout_client.get_json(url, params=params)
+
+    async def poll_once(self) -> int:
+        """Sweep every watched chain once; returns the number of alerts sent"""
+        alerts = 0
+        for chain_id, watchers in self.watchlist.by_chain().items():
+            try:
+                alerts += await self._poll_chain(chain_id, watchers)
+            except Exception as e:
+                logger.warning(f"Watch sweep failed for chain {chain_id}: {e}")
+        return alerts
+
+    async def _poll_chain(self, chain_id: str, watchers: Dict[str, List[int]]) -> int:
+        base_url = await self.api_url(chain_id)
+        if base_url is None:
+            return 0
+        blocks = await self._get(f"{base_url}/blocks", {"type": "block"})
+        head = int(((blocks.get("items") or [{}])[0]).get("height") or 0)
+        if not head:
+            return 0
+
+        cursors = self.watchlist.cursors(chain_id)
+        for address in watchers:
+            if address not in cursors:
+                self.watchlist.set_cursor(chain_id, address, head)  # Only alert on activity after the watch
+        addresses = [address for address in watchers if address in cursors and cursors[address] < head]
+        if not addresses:
+            return 0
+
+        alerts = failed = 0
+        for start in range(0, len(addresses), self.batch_size):
+            batch = addresses[start:start + self.batch_size]
+            pages = await asyncio.gather(
+                *(self._get(f"{base_url}/addresses/{address}/transactions") for address in batch),
+                return_exceptions=True,
+            )
+            for address, page in zip(batch, pages):
+                if isinstance(page, BaseException):
+                    # Cursor stays put so the next sweep retries this range
+                    logger.warning(f"Watch fetch failed for {address} on chain {chain_id}: {page}")
+                    failed += 1
+                    continue
+                cursor = cursors[address]
+                new = [tx for tx in page.get("items") or [] if cursor < _block_number(tx) <= head]
+                if new:
+                    text = format_alert(address, chain_id, self.chain_name(chain_id), new)
+                    for chat_id in watchers[address]:
+                        await self.notify(chat_id, text)
+                        alerts += 1
+                self.watchlist.set_cursor(chain_id, address, head)
+
+        logger.info(
+            f"👀 Watch sweep chain {chain_id} to block {head}: {len(addresses)} address(es), "
+            f"{failed} failed, {alerts} alert(s)"
+        )
+        return alerts
+
+    async def _poll_forever(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                logger.warning(f"Watch sweep failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the background sweep task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._poll_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+# Shared watchlist for the whole bot process
+watchlist = Watchlist()
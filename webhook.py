@@ -0,0 +1,98 @@
+"""
+BlockScout AI - Webhook server
+Serves Telegram updates over a local aiohttp server as an alternative to long polling
+"""
+
+import os
+import hmac
+import signal
+import asyncio
+import logging
+
+from aiohttp import web
+from telegram import Update
+from telegram.ext import Application
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("PORT", "8080"))  # Railway/Heroku provide PORT for web processes
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/telegram")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+# Public base URL registered with Telegram; leave unset to test locally without setWebhook
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+
+
+def build_webhook_app(application: Application, path: str = WEBHOOK_PATH, secret: str = WEBHOOK_SECRET) -> web.Application:
+    """aiohttp app that validates incoming updates and feeds them to the bot"""
+
+    async def handle_update(request: web.Request) -> web.Response:
+        if secret and not hmac.compare_digest(request.headers.get(SECRET_HEADER, ""), secret):
+            logger.warning("Rejected webhook call with invalid secret token")
+            return web.Response(status=403)
+
+        try:
+            data = await request.json()
+        except ValueError:
+            return web.Response(status=400, text="Invalid JSON")
+
+        try:
+            update = Update.de_json(data, application.bot)
+        except (TypeError, KeyError, AttributeError):
+            update = None
+        if update is None:
+            return web.Response(status=400, text="Invalid update")
+
+        # Handlers run on the application's workers; acknowledge Telegram right away
+        await application.update_queue.put(update)
+        return web.Response()
+
+    async def health(request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+
+    app = web.Application()
+    app.router.add_post(path, handle_update)
+    app.router.add_get("/healthz", health)
+    return app
+
+
+async def run_webhook(application: Application) -> None:
+    """Run the bot behind the webhook server until SIGINT/SIGTERM"""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    async with application:
+        if application.post_init:
+            await application.post_init(application)
+
+        if WEBHOOK_URL:
+            await application.bot.set_webhook(
+                url=WEBHOOK_URL.rstrip("/") + WEBHOOK_PATH,
+                secret_token=WEBHOOK_SECRET,
+                allowed_updates=Update.ALL_TYPES,
+            )
+            logger.info(f"Registered webhook {WEBHOOK_URL.rstrip('/')}{WEBHOOK_PATH}")
+        else:
+            logger.info("WEBHOOK_URL not set - skipping setWebhook (local mode)")
+
+        await application.start()
+
+        runner = web.AppRunner(build_webhook_app(application))
+        await runner.setup()
+        await web.TCPSite(runner, WEBHOOK_HOST, WEBHOOK_PORT).start()
+        logger.info(f"🌐 Webhook server listening on {WEBHOOK_HOST}:{WEBHOOK_PORT}{WEBHOOK_PATH}")
+
+        try:
+            await stop.wait()
+        finally:
+            await runner.cleanup()
+            await application.stop()
+            if application.post_shutdown:
+                await application.post_shutdown(application)